@@ -5,9 +5,8 @@ import asyncio
 import os
 from pathlib import Path
 
-import requests
-
-from wokwi_client import GET_TOKEN_URL, WokwiClient
+from examples.helper.http import download_file, is_fresh
+from wokwi_client import GET_TOKEN_URL, WokwiClient, run
 
 EXAMPLE_DIR = Path(__file__).parent
 HELLO_WORLD_URL = "https://github.com/wokwi/esp-idf-hello-world/raw/refs/heads/main/bin"
@@ -18,6 +17,14 @@ FIRMWARE_FILES = {
 SLEEP_TIME = int(os.getenv("WOKWI_SLEEP_TIME", "10"))
 
 
+def fetch_firmware() -> None:
+    for filename, url in FIRMWARE_FILES.items():
+        if is_fresh(EXAMPLE_DIR / filename, url):
+            continue
+        print(f"Downloading {filename} from {url}")
+        download_file(url, EXAMPLE_DIR / filename)
+
+
 async def main() -> None:
     token = os.getenv("WOKWI_CLI_TOKEN")
     if not token:
@@ -25,25 +32,21 @@ async def main() -> None:
             f"Set WOKWI_CLI_TOKEN in your environment. You can get it from {GET_TOKEN_URL}."
         )
 
-    for filename, url in FIRMWARE_FILES.items():
-        if (EXAMPLE_DIR / filename).exists():
-            continue
-        print(f"Downloading {filename} from {url}")
-        response = requests.get(url)
-        response.raise_for_status()
-        with open(EXAMPLE_DIR / filename, "wb") as f:
-            f.write(response.content)
-
     client = WokwiClient(token)
     print(f"Wokwi client library version: {client.version}")
 
-    hello = await client.connect()
+    # Download the firmware in a worker thread while connecting to the simulator
+    hello, _ = await asyncio.gather(client.connect(), asyncio.to_thread(fetch_firmware))
     print("Connected to Wokwi Simulator, server version:", hello["version"])
 
     # Upload the diagram and firmware files
-    await client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json")
-    await client.upload_file("hello_world.bin", EXAMPLE_DIR / "hello_world.bin")
-    await client.upload_file("hello_world.elf", EXAMPLE_DIR / "hello_world.elf")
+    await client.upload_many(
+        {
+            "diagram.json": EXAMPLE_DIR / "diagram.json",
+            "hello_world.bin": EXAMPLE_DIR / "hello_world.bin",
+            "hello_world.elf": EXAMPLE_DIR / "hello_world.elf",
+        }
+    )
 
     # Start the simulation
     await client.start_simulation(
@@ -68,4 +71,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 
 from examples.helper.github_download import download_github_dir
-from wokwi_client import GET_TOKEN_URL, WokwiClient
+from wokwi_client import GET_TOKEN_URL, WokwiClient, run
 
 # sys.path.append(str(Path(__file__).parent.parent))
 # from github_download import download_github_dir
@@ -27,25 +27,31 @@ async def main() -> None:
             f"Set WOKWI_CLI_TOKEN in your environment. You can get it from {GET_TOKEN_URL}."
         )
 
-    # Automatically download build files from GitHub if missing
-    build_dir = EXAMPLE_DIR / "build"
-    download_github_dir(
-        user=USER,
-        repo=REPO,
-        path=PATH,
-        base_path=build_dir,
-        ref=REF,
-    )
-
     client = WokwiClient(token)
     print(f"Wokwi client library version: {client.version}")
 
-    hello = await client.connect()
+    # Automatically download build files from GitHub if missing, in a worker thread
+    # while connecting to the simulator
+    build_dir = EXAMPLE_DIR / "build"
+    hello, _ = await asyncio.gather(
+        client.connect(),
+        asyncio.to_thread(
+            download_github_dir,
+            user=USER,
+            repo=REPO,
+            path=PATH,
+            base_path=build_dir,
+            ref=REF,
+            manifest=EXAMPLE_DIR / "manifest.json",
+        ),
+    )
     print("Connected to Wokwi Simulator, server version:", hello["version"])
 
-    # Upload the diagram and firmware files
-    await client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json")
-    idf = await client.upload_idf_firmware(EXAMPLE_DIR / "build" / "flasher_args.json")
+    # Upload the diagram and firmware files (concurrently, requests are matched by id)
+    _, idf = await asyncio.gather(
+        client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json"),
+        client.upload_idf_firmware(EXAMPLE_DIR / "build" / "flasher_args.json"),
+    )
 
     # Start the simulation
     await client.start_simulation(
@@ -75,4 +81,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,8 +4,7 @@
 import os
 from pathlib import Path
 
-import requests
-
+from examples.helper.http import download_file, is_fresh
 from wokwi_client import GET_TOKEN_URL, WokwiClientSync
 
 EXAMPLE_DIR = Path(__file__).parent
@@ -25,13 +24,10 @@ def main() -> None:
         )
 
     for filename, url in FIRMWARE_FILES.items():
-        if (EXAMPLE_DIR / filename).exists():
+        if is_fresh(EXAMPLE_DIR / filename, url):
             continue
         print(f"Downloading {filename} from {url}")
-        response = requests.get(url)
-        response.raise_for_status()
-        with open(EXAMPLE_DIR / filename, "wb") as f:
-            f.write(response.content)
+        download_file(url, EXAMPLE_DIR / filename)
 
     client = WokwiClientSync(token)
     print(f"Wokwi client library version: {client.version}")
@@ -40,9 +36,13 @@ def main() -> None:
     print("Connected to Wokwi Simulator, server version:", hello["version"])
 
     # Upload the diagram and firmware files
-    client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json")
-    client.upload_file("hello_world.bin", EXAMPLE_DIR / "hello_world.bin")
-    client.upload_file("hello_world.elf", EXAMPLE_DIR / "hello_world.elf")
+    client.upload_many(
+        {
+            "diagram.json": EXAMPLE_DIR / "diagram.json",
+            "hello_world.bin": EXAMPLE_DIR / "hello_world.bin",
+            "hello_world.elf": EXAMPLE_DIR / "hello_world.elf",
+        }
+    )
 
     # Start the simulation
     client.start_simulation(
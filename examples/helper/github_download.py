@@ -1,12 +1,24 @@
+import hashlib
+import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import requests
 
+from . import http
+
 # Use GITHUB_TOKEN for higher API rate limits (automatic in GitHub Actions)
 _GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
 
+# Upper bound on concurrent requests, keeps us clear of GitHub's secondary rate limits
+_MAX_WORKERS = 16
+
+# Directory listings are cached here, so repeated runs don't eat into the API rate limit
+_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "wokwi-client" / "github"
+
 
 def _github_headers() -> dict[str, str]:
     headers: dict[str, str] = {}
@@ -16,27 +28,111 @@ def _github_headers() -> dict[str, str]:
 
 
 def download_file(url: str, dest: Path) -> None:
-    response = requests.get(url, headers=_github_headers())
+    http.download_file(url, dest, headers=_github_headers())
+
+
+def _write_atomic(dest: Path, data: bytes) -> None:
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
+
+
+def _cached_get(url: str, cache_key: str, immutable: bool = False) -> Any:
+    """GET a JSON document, caching the body (and its ETag) on disk.
+
+    Immutable resources are served straight from the cache. Everything else is
+    revalidated with `If-None-Match`, so an unchanged resource costs a 304 only.
+    """
+    key = hashlib.sha256(cache_key.encode()).hexdigest()
+    body_path = _CACHE_DIR / f"{key}.json"
+    etag_path = _CACHE_DIR / f"{key}.etag"
+
+    headers = _github_headers()
+    if body_path.exists():
+        if immutable:
+            return json.loads(body_path.read_bytes())
+        if etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text()
+
+    response = http.SESSION.get(url, headers=headers)
+    if response.status_code == requests.codes.not_modified:
+        return json.loads(body_path.read_bytes())
     response.raise_for_status()
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest, "wb") as f:
-        f.write(response.content)
 
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(body_path, response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        _write_atomic(etag_path, etag.encode())
+    return response.json()
 
-def download_github_dir(
-    user: str, repo: str, path: str, base_path: Path, ref: str = "main"
+
+def _list_github_tree(user: str, repo: str, ref: str) -> list[dict[str, Any]]:
+    """List every entry of the repository tree at `ref` with a single API request."""
+    api_url = f"https://api.github.com/repos/{user}/{repo}/git/trees/{ref}?recursive=1"
+    # A full commit SHA can never point at different content, so its listing never expires
+    immutable = re.fullmatch(r"[0-9a-f]{40}", ref) is not None
+    tree = _cached_get(api_url, f"{user}/{repo}@{ref}", immutable=immutable)
+    if tree.get("truncated"):
+        raise RuntimeError(f"GitHub returned a truncated tree for {user}/{repo}@{ref}")
+    entries: list[dict[str, Any]] = tree["tree"]
+    return entries
+
+
+def _build_manifest(user: str, repo: str, path: str, ref: str) -> list[dict[str, Any]]:
+    """List the files under `path`, with their size and raw.githubusercontent.com URL."""
+    prefix = path.strip("/") + "/"
+    return [
+        {
+            "path": entry["path"][len(prefix) :],
+            "size": entry["size"],
+            "url": f"https://raw.githubusercontent.com/{user}/{repo}/{ref}/{entry['path']}",
+        }
+        for entry in _list_github_tree(user, repo, ref)
+        if entry["type"] == "blob" and entry["path"].startswith(prefix)
+    ]
+
+
+def download_github_dir(  # noqa: PLR0913
+    user: str,
+    repo: str,
+    path: str,
+    base_path: Path,
+    ref: str = "main",
+    *,
+    manifest: Optional[Path] = None,
 ) -> None:
-    api_url = f"https://api.github.com/repos/{user}/{repo}/contents/{path}?ref={ref}"
-    response = requests.get(api_url, headers=_github_headers())
-    response.raise_for_status()
-    items = response.json()
-    for item in items:
-        if item["type"] == "file":
-            dest = base_path / item["name"]
-            if dest.exists():
-                continue
+    """Download a directory tree from GitHub.
+
+    The whole repository tree is listed with one API request, and the files under `path`
+    are then fetched concurrently from raw.githubusercontent.com, which doesn't count
+    against the API rate limit.
+
+    If `manifest` is given and `ref` is a full commit SHA, the file list is read from
+    (or, on first use, written to) that JSON file, so no API request is needed at all.
+    Commit the manifest next to the example to make that the case on a fresh checkout.
+    """
+    pinned = re.fullmatch(r"[0-9a-f]{40}", ref) is not None
+    if manifest is not None and pinned and manifest.exists():
+        files: list[dict[str, Any]] = json.loads(manifest.read_bytes())
+    else:
+        files = _build_manifest(user, repo, path, ref)
+        if manifest is not None and pinned:
+            _write_atomic(manifest, json.dumps(files, indent=2).encode() + b"\n")
+
+    downloads: list[tuple[str, Path]] = []
+    for file in files:
+        dest = base_path / file["path"]
+        # The listing carries the file size, so a truncated download is caught without
+        # an extra request
+        if dest.exists() and dest.stat().st_size == file["size"]:
+            continue
+        downloads.append((file["url"], dest))
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+        futures = []
+        for url, dest in downloads:
             print(f"Downloading {dest}...")
-            download_file(item["download_url"], dest)
-        elif item["type"] == "dir":
-            subdir_name = item["name"]
-            download_github_dir(user, repo, f"{path}/{subdir_name}", base_path / subdir_name, ref)
+            futures.append(pool.submit(download_file, url, dest))
+        for future in futures:
+            future.result()
@@ -0,0 +1,91 @@
+import atexit
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Hosts the examples download from (github.com/raw redirects to raw.githubusercontent.com)
+KNOWN_HOSTS = ("github.com", "raw.githubusercontent.com", "api.github.com", "micropython.org")
+
+# One session for all downloads, so requests to the same host reuse a keep-alive
+# connection (and its DNS lookup) instead of paying for a new TCP + TLS handshake.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        # One pool per host, so no host's warm connection gets evicted by another's
+        pool_connections=len(KNOWN_HOSTS),
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    ),
+)
+atexit.register(SESSION.close)
+
+_CHUNK_SIZE = 64 * 1024
+# Seconds to wait for the freshness check, so an unreachable network can't stall the
+# examples; the cached file is used instead
+_HEAD_TIMEOUT = 5
+
+
+def _etag_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".etag")
+
+
+def is_fresh(dest: Path, url: str, headers: Optional[dict[str, str]] = None) -> bool:
+    """Check whether `dest` is a complete, up-to-date copy of `url`.
+
+    Issues a HEAD request and compares Content-Length against the local file size, and
+    the server ETag against the one recorded at download time. If the server can't be
+    reached within a few seconds, an existing file is assumed to be fine so the examples
+    keep working offline.
+    """
+    if not dest.exists():
+        return False
+    try:
+        response = SESSION.head(
+            url,
+            headers={**(headers or {}), "Accept-Encoding": "identity"},
+            allow_redirects=True,
+            timeout=_HEAD_TIMEOUT,
+        )
+        response.raise_for_status()
+    except requests.RequestException:
+        return True
+    length = response.headers.get("Content-Length")
+    if length is not None and int(length) != dest.stat().st_size:
+        return False
+    etag = response.headers.get("ETag")
+    etag_path = _etag_path(dest)
+    return not (etag and etag_path.exists() and etag_path.read_text() != etag)
+
+
+def download_file(url: str, dest: Path, headers: Optional[dict[str, str]] = None) -> None:
+    """Stream `url` into `dest` in chunks, without buffering the whole body in memory.
+
+    The body is written to a temporary file first and moved into place once complete,
+    so an interrupted download never leaves a truncated `dest` behind.
+    """
+    with SESSION.get(url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        # Let urllib3 undo any Content-Encoding (e.g. gzip) while we copy
+        response.raw.decode_content = True
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process name, so concurrent runs don't write into each other's file
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                shutil.copyfileobj(response.raw, f, length=_CHUNK_SIZE)
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        etag = response.headers.get("ETag")
+        if etag:
+            _etag_path(dest).write_text(etag)
+        else:
+            # An ETag recorded for the previous download no longer describes this file
+            _etag_path(dest).unlink(missing_ok=True)
@@ -12,14 +12,14 @@ This example demonstrates how to:
 The VCD file can be viewed in tools like PulseView or GTKWave.
 """
 
-import asyncio
 import os
 from pathlib import Path
 
-from wokwi_client import GET_TOKEN_URL, WokwiClient
+from wokwi_client import GET_TOKEN_URL, WokwiClient, run
 
 EXAMPLE_DIR = Path(__file__).parent
 SLEEP_TIME = float(os.getenv("WOKWI_SLEEP_TIME", "1"))
+OUTPUT_PATH = Path(os.getenv("LOGIC_ANALYZER_OUTPUT", EXAMPLE_DIR / "output.vcd"))
 
 
 async def main() -> None:
@@ -37,8 +37,9 @@ async def main() -> None:
     print("Connected to Wokwi Simulator, server version:", hello["version"])
 
     # Upload the diagram and dummy firmware
-    await client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json")
-    await client.upload_file("dummy.hex", EXAMPLE_DIR / "dummy.hex")
+    await client.upload_many(
+        {"diagram.json": EXAMPLE_DIR / "diagram.json", "dummy.hex": EXAMPLE_DIR / "dummy.hex"}
+    )
 
     # Start the simulation
     await client.start_simulation(firmware="dummy.hex", pause=True)
@@ -52,9 +53,8 @@ async def main() -> None:
     print(f"Captured {vcd_data['sample_count']} samples on {vcd_data['channel_count']} channel(s)")
 
     # Save to file
-    vcd_path = EXAMPLE_DIR / "output.vcd"
-    await client.save_vcd(vcd_path)
-    print(f"VCD data saved to: {vcd_path}")
+    await client.save_vcd(OUTPUT_PATH)
+    print(f"VCD data saved to: {OUTPUT_PATH}")
 
     # Also print first few lines of the VCD for verification
     vcd_lines = vcd_data["vcd"].split("\n")[:15]
@@ -67,4 +67,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
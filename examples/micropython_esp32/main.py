@@ -2,13 +2,18 @@
 # Copyright (C) 2025, CodeMagic LTD
 
 import asyncio
+import hashlib
 import os
+import shutil
+import subprocess
+import tempfile
 from pathlib import Path
+from typing import Optional
 
-import requests
 from littlefs import LittleFS
 
-from wokwi_client import GET_TOKEN_URL, WokwiClient
+from examples.helper.http import download_file, is_fresh
+from wokwi_client import GET_TOKEN_URL, WokwiClient, run
 
 EXAMPLE_DIR = Path(__file__).parent
 FIRMWARE_NAME = "ESP32_GENERIC-20250415-v1.25.0.bin"
@@ -19,6 +24,9 @@ FLASH_SIZE = 0x400000
 FS_OFFSET = 0x200000
 FS_SIZE = 0x200000
 SLEEP_TIME = int(os.getenv("WOKWI_SLEEP_TIME", "3"))
+# Optional: stop as soon as this text shows up in the serial output (SLEEP_TIME is then only
+# the upper bound)
+WAIT_FOR = os.getenv("WOKWI_WAIT_FOR")
 
 MICROPYTHON_CODE = """
 # This is a MicroPython script that runs on the simulated ESP32 chip.
@@ -36,7 +44,7 @@ print("--------------------------------")
 
 # Chip information
 print(f"CPU Frequency: {machine.freq()}")
-mac_address = ':'.join(['{:02x}'.format(x) for x in machine.unique_id()])
+mac_address = machine.unique_id().hex(':')
 print(f"MAC Address: {mac_address}")
 
 # Memory information
@@ -55,55 +63,137 @@ print("--------------------------------")
 """
 
 
-async def main() -> None:
-    token = os.getenv("WOKWI_CLI_TOKEN")
-    if not token:
+def build_mpy(source: str) -> Optional[bytes]:
+    """Precompile `source` to MicroPython bytecode with mpy-cross, so the ESP32 doesn't
+    have to compile it at boot. Returns None if mpy-cross is not installed.
+
+    The mpy-cross version must match the firmware (v1.25), e.g. `pip install mpy-cross==1.25.*`.
+    """
+    mpy_cross = shutil.which("mpy-cross")
+    if mpy_cross is None:
+        return None
+    key = hashlib.sha256(source.encode()).hexdigest()
+    mpy_file = EXAMPLE_DIR / f"app-{key[:16]}.mpy"
+    if not mpy_file.exists():
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_file = Path(tmp_dir) / "app.py"
+            source_file.write_text(source)
+            output_file = Path(tmp_dir) / "app.mpy"
+            subprocess.run(
+                [mpy_cross, "-march=xtensawin", "-o", str(output_file), str(source_file)],
+                check=True,
+            )
+            os.replace(output_file, mpy_file)
+    return mpy_file.read_bytes()
+
+
+def build_firmware() -> memoryview:
+    if not is_fresh(FIRMWARE_FILE, FIRMWARE_URL):
+        print(f"Downloading {FIRMWARE_NAME} from {FIRMWARE_URL}")
+        download_file(FIRMWARE_URL, FIRMWARE_FILE)
+
+    # MicroPython only runs main.py at boot, so a precompiled script goes into app.mpy,
+    # which main.py imports
+    app_mpy = build_mpy(MICROPYTHON_CODE)
+    if app_mpy is not None:
+        files = {"main.py": b"import app\n", "app.mpy": app_mpy}
+    else:
+        files = {"main.py": MICROPYTHON_CODE.encode()}
+
+    # The image only depends on the firmware and the files, so reuse a previous build if
+    # none of them has changed
+    digest = hashlib.sha256(FIRMWARE_FILE.read_bytes())
+    for name, content in files.items():
+        digest.update(name.encode() + b"\0" + content)
+    key = digest.hexdigest()
+    image_file = EXAMPLE_DIR / f"firmware-{key[:16]}.bin"
+    if image_file.exists():
+        return memoryview(image_file.read_bytes())
+
+    # Build the flash image in place: read the firmware straight into the image buffer
+    # and copy the filesystem over through a memoryview, without intermediate copies.
+    firmware_size = FIRMWARE_FILE.stat().st_size
+    if FIRMWARE_OFFSET + firmware_size > FS_OFFSET:
         raise SystemExit(
-            f"Set WOKWI_CLI_TOKEN in your environment. You can get it from {GET_TOKEN_URL}."
+            f"{FIRMWARE_NAME} ({firmware_size} bytes) does not fit below the filesystem "
+            f"at {FS_OFFSET:#x}"
         )
-
-    if not FIRMWARE_FILE.exists():
-        print(f"Downloading {FIRMWARE_NAME} from {FIRMWARE_URL}")
-        response = requests.get(FIRMWARE_URL)
-        response.raise_for_status()
-        with open(FIRMWARE_FILE, "wb") as f:
-            f.write(response.content)
-
     firmware_data = bytearray(FLASH_SIZE)
-    with open(FIRMWARE_FILE, "rb") as f:
-        firmware_data[FIRMWARE_OFFSET : FIRMWARE_OFFSET + f.tell()] = f.read()
+    firmware_view = memoryview(firmware_data)
+    with open(FIRMWARE_FILE, "rb", buffering=0) as f:
+        f.readinto(firmware_view[FIRMWARE_OFFSET : FIRMWARE_OFFSET + firmware_size])
 
     # Inject some micropython code into a littlefs filesystem inside the firmware image
     lfs = LittleFS(block_size=4096, block_count=512, prog_size=256)
-    with lfs.open("main.py", "w") as lfs_file:
-        lfs_file.write(MICROPYTHON_CODE)
-    firmware_data[FS_OFFSET : FS_OFFSET + FS_SIZE] = lfs.context.buffer
+    for name, content in files.items():
+        with lfs.open(name, "wb") as lfs_file:
+            lfs_file.write(content)
+    firmware_view[FS_OFFSET : FS_OFFSET + FS_SIZE] = lfs.context.buffer
+
+    tmp_file = image_file.with_name(image_file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(firmware_view)
+    os.replace(tmp_file, image_file)
+    return firmware_view
+
 
-    with open(EXAMPLE_DIR / "firmware.bin", "wb") as f:
-        f.write(bytes(firmware_data))
+async def print_serial_until(client: WokwiClient, text: bytes) -> None:
+    """Print the serial output until a line containing `text` is received."""
+    found = asyncio.Event()
+
+    def on_line(line: bytes) -> None:
+        print(line.decode(errors="replace"), end="")
+        if text in line:
+            found.set()
+
+    client.serial_monitor(on_line)
+    await found.wait()
+
+
+async def main() -> None:
+    token = os.getenv("WOKWI_CLI_TOKEN")
+    if not token:
+        raise SystemExit(
+            f"Set WOKWI_CLI_TOKEN in your environment. You can get it from {GET_TOKEN_URL}."
+        )
 
     client = WokwiClient(token)
     print(f"Wokwi client library version: {client.version}")
 
-    hello = await client.connect()
+    # Download and build the firmware in a worker thread while connecting to the simulator
+    hello, firmware_view = await asyncio.gather(client.connect(), asyncio.to_thread(build_firmware))
     print("Connected to Wokwi Simulator, server version:", hello["version"])
 
-    # Upload the diagram and firmware files
-    await client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json")
-    await client.upload(FIRMWARE_NAME, bytes(firmware_data))
+    # Upload the diagram and firmware files (concurrently, requests are matched by id)
+    await asyncio.gather(
+        client.upload_file("diagram.json", EXAMPLE_DIR / "diagram.json"),
+        client.upload(FIRMWARE_NAME, firmware_view),
+    )
 
     # Start the simulation
     await client.start_simulation(firmware=FIRMWARE_NAME)
 
-    # Stream serial output for a few seconds
-    serial_task = asyncio.create_task(client.serial_monitor_cat())
-    print(f"Simulation started, waiting for {SLEEP_TIME} seconds…")
-    await client.wait_until_simulation_time(SLEEP_TIME)
-    serial_task.cancel()
+    if WAIT_FOR:
+        # Stream serial output until the expected text shows up, or the time is up
+        print(f"Simulation started, waiting up to {SLEEP_TIME} seconds for {WAIT_FOR!r}…")
+        waiters = {
+            asyncio.create_task(print_serial_until(client, WAIT_FOR.encode())),
+            asyncio.create_task(client.wait_until_simulation_time(SLEEP_TIME)),
+        }
+        _, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        client.stop_serial_monitors()
+    else:
+        # Stream serial output for a few seconds
+        serial_task = asyncio.create_task(client.serial_monitor_cat())
+        print(f"Simulation started, waiting for {SLEEP_TIME} seconds…")
+        await client.wait_until_simulation_time(SLEEP_TIME)
+        serial_task.cancel()
 
     # Disconnect from the simulator
     await client.disconnect()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -16,6 +16,8 @@ from .client import WokwiClient
 from .client_sync import WokwiClientSync
 from .constants import GET_TOKEN_URL
 from .file_ops import FlashSection, IdfFirmwareUploadResult
+from .idf import clear_firmware_cache
+from .runner import install_uvloop, run
 from .vcd import VCDData
 
 __version__ = get_version()
@@ -27,4 +29,7 @@ __all__ = [
     "VCDData",
     "__version__",
     "GET_TOKEN_URL",
+    "run",
+    "install_uvloop",
+    "clear_firmware_cache",
 ]
@@ -2,15 +2,18 @@
 #
 # SPDX-License-Identifier: MIT
 
-from importlib.metadata import PackageNotFoundError, version
+__version__: str
 
-try:  # works for normal + editable installs
-    __version__: str = version(__name__.replace("_", "-"))
-except PackageNotFoundError:  # running from a raw source tree
-    try:
-        # if you use hatch-vcs, this tiny module is auto-generated at build time
-        from ._version import version as __version__  # type: ignore
-    except ModuleNotFoundError:
+try:
+    # generated by hatch-vcs at build time (see pyproject.toml); a plain import is much
+    # cheaper than scanning sys.path for the package metadata
+    from ._version import version as __version__  # type: ignore
+except ModuleNotFoundError:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:  # installed without the build hook
+        __version__ = version(__name__.replace("_", "-"))
+    except PackageNotFoundError:  # running from a raw source tree
         __version__ = "0.0.0+local"
 
 
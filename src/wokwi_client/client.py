@@ -2,17 +2,20 @@
 #
 # SPDX-License-Identifier: MIT
 
+from __future__ import annotations
+
 import asyncio
-import base64
+import binascii
 import inspect
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import Any, Callable, Optional, Union, cast
+from typing import Any, Callable, cast
 
 from .__version__ import get_version
 from .constants import DEFAULT_WS_URL
-from .control import set_control
+from .control import set_control, set_control_many
 from .event_queue import EventQueue
-from .exceptions import ProtocolError
+from .exceptions import ProtocolError, WokwiError
 from .file_ops import (
     FlashSection,
     IdfFirmwareUploadResult,
@@ -20,19 +23,37 @@ from .file_ops import (
     upload,
     upload_file,
     upload_idf_firmware,
+    upload_many,
+    write_base64_file,
 )
 from .framebuffer import (
+    compare_framebuffer_png,
     read_framebuffer_png_bytes,
     save_framebuffer_png,
 )
-from .pins import PinReadMessage, gpio_list, pin_listen, pin_read
+from .pins import (
+    PinReadMessage,
+    gpio_list,
+    pin_listen,
+    pin_listen_many,
+    pin_read,
+    pin_read_many,
+)
 from .protocol_types import EventMessage
-from .serial import monitor_lines, write_serial
+from .serial import StdoutWriter, monitor_lines, monitor_payloads, write_serial, write_serial_bytes
 from .simulation import pause, restart, resume, start
 from .touch import touch_event
 from .transport import Transport
 from .vcd import VCDData, read_vcd, save_vcd
 
+# How long serial_write_buffered() collects data before sending it
+_SERIAL_WRITE_DELAY = 0.005
+
+
+def _consume_exception(task: asyncio.Task[None]) -> None:
+    if not task.cancelled():
+        task.exception()
+
 
 class WokwiClient:
     """
@@ -43,10 +64,22 @@ class WokwiClient:
     and applications. For a synchronous interface, see WokwiClientSync.
     """
 
+    __slots__ = (
+        "version",
+        "last_pause_nanos",
+        "_transport",
+        "_paused",
+        "_pause_queue",
+        "_serial_monitor_tasks",
+        "_serial_out",
+        "_serial_flush_handle",
+        "_serial_flush_task",
+    )
+
     version: str
     last_pause_nanos: int
 
-    def __init__(self, token: str, server: Optional[str] = None):
+    def __init__(self, token: str, server: str | None = None):
         """
         Initialize the WokwiClient.
 
@@ -57,10 +90,18 @@ class WokwiClient:
         self.version = get_version()
         self._transport = Transport(token, server or DEFAULT_WS_URL)
         self.last_pause_nanos = 0
+        # Whether the simulation is known to be paused (tracked from sim:pause events and
+        # our own start/pause/resume/restart calls), so we can skip redundant pause requests
+        self._paused = False
         self._transport.add_event_listener("sim:pause", self._on_pause)
-        # Lazily create in an active event loop (important for py3.9 and sync client)
-        self._pause_queue: Optional[EventQueue] = None
+        # Created in connect(), so it binds to the running event loop (important for py3.9
+        # and sync client)
+        self._pause_queue: EventQueue | None = None
         self._serial_monitor_tasks: set[asyncio.Task[None]] = set()
+        # Pending serial_write_buffered() data, and the timer / task that will send it
+        self._serial_out = bytearray()
+        self._serial_flush_handle: asyncio.TimerHandle | None = None
+        self._serial_flush_task: asyncio.Task[None] | None = None
 
     async def connect(self) -> dict[str, Any]:
         """
@@ -69,28 +110,45 @@ class WokwiClient:
         Returns:
             A dictionary with server information (e.g., version).
         """
-        return await self._transport.connect()
+        hello = await self._transport.connect()
+        # Subscribe up front, to keep this out of the wait_until_simulation_time() path
+        if self._pause_queue is None:
+            self._pause_queue = EventQueue(self._transport, "sim:pause")
+        return hello
 
     async def disconnect(self) -> None:
         """
         Disconnect from the Wokwi simulator server.
 
-        This also stops all active serial monitors.
+        This also stops all active serial monitors, after sending any buffered serial data.
+        If sending that data fails, the connection is still closed and the error is raised.
         """
         self.stop_serial_monitors()
-        await self._transport.close()
-
-    async def upload(self, name: str, content: bytes) -> None:
+        try:
+            await self.flush_serial()
+        finally:
+            # Whatever could not be sent belongs to this session, don't send it after a
+            # reconnect
+            self._serial_out.clear()
+            await self._transport.close()
+            # Pause events of this session are stale after a reconnect, and the queue is
+            # tied to the current event loop; connect() subscribes a fresh one
+            if self._pause_queue is not None:
+                self._pause_queue.close()
+                self._pause_queue = None
+
+    async def upload(self, name: str, content: bytes | bytearray | memoryview) -> None:
         """
         Upload a file to the simulator from bytes content.
 
         Args:
             name: The name to use for the uploaded file.
-            content: The file content as bytes.
+            content: The file content as bytes, or any bytes-like object (bytearray,
+                memoryview), which is uploaded without being copied first.
         """
         await upload(self._transport, name, content)
 
-    async def upload_file(self, filename: str, local_path: Optional[Path] = None) -> str:
+    async def upload_file(self, filename: str, local_path: Path | None = None) -> str:
         """
         Upload a local file to the simulator.
 
@@ -102,7 +160,20 @@ class WokwiClient:
         """
         return await upload_file(self._transport, filename, local_path)
 
-    async def upload_idf_firmware(self, flasher_args_path: "str | Path") -> IdfFirmwareUploadResult:
+    async def upload_many(self, files: Mapping[str, bytes | bytearray | memoryview | Path]) -> None:
+        """
+        Upload several files to the simulator at once.
+
+        All uploads are sent before waiting for any response, so this takes a single
+        round-trip instead of one per file.
+
+        Args:
+            files: Maps the name to use for each uploaded file to its content, given as
+                bytes (or any bytes-like object) or as the Path of a local file.
+        """
+        await upload_many(self._transport, files)
+
+    async def upload_idf_firmware(self, flasher_args_path: str | Path) -> IdfFirmwareUploadResult:
         """
         Upload ESP-IDF firmware from a flasher_args.json file.
 
@@ -127,9 +198,10 @@ class WokwiClient:
             The downloaded file content as bytes.
         """
         result = await download(self._transport, name)
-        return base64.b64decode(result["result"]["binary"])
+        # Decode the str directly: b64decode() would first copy it into an ASCII bytes object
+        return binascii.a2b_base64(result["result"]["binary"])
 
-    async def download_file(self, name: str, local_path: Optional[Path] = None) -> None:
+    async def download_file(self, name: str, local_path: Path | None = None) -> None:
         """
         Download a file from the simulator and save it to a local path.
 
@@ -140,17 +212,17 @@ class WokwiClient:
         if local_path is None:
             local_path = Path(name)
 
-        result = await self.download(name)
-        with open(local_path, "wb") as f:
-            f.write(result)
+        result = await download(self._transport, name)
+        # Decode and write from a worker thread, so a slow disk doesn't stall the event loop
+        await asyncio.to_thread(write_base64_file, Path(local_path), result["result"]["binary"])
 
     async def start_simulation(
         self,
-        firmware: "str | list[FlashSection] | None" = None,
-        elf: Optional[str] = None,
+        firmware: str | list[FlashSection] | None = None,
+        elf: str | None = None,
         pause: bool = False,
-        chips: list[str] = [],
-        flash_size: Optional[int] = None,
+        chips: Sequence[str] | None = None,
+        flash_size: int | None = None,
     ) -> None:
         """
         Start a new simulation with the given parameters.
@@ -177,7 +249,7 @@ class WokwiClient:
                 objects (from upload_idf_firmware).
             elf: The ELF file filename (optional).
             pause: Whether to start the simulation paused (default: False).
-            chips: List of custom chips to load into the simulation (default: empty list).
+            chips: List of custom chips to load into the simulation (default: none).
             flash_size: Flash size in megabytes (optional, typically from IdfFirmwareUploadResult).
         """
         await start(
@@ -188,37 +260,54 @@ class WokwiClient:
             pause=pause,
             chips=chips,
         )
+        self.last_pause_nanos = 0
+        self._paused = pause
 
     async def pause_simulation(self) -> None:
         """
         Pause the running simulation.
         """
         await pause(self._transport)
+        self._paused = True
 
-    async def resume_simulation(self, pause_after: Optional[int] = None) -> None:
+    async def resume_simulation(self, pause_after: int | None = None) -> None:
         """
         Resume the simulation, optionally pausing after a given number of nanoseconds.
 
         Args:
             pause_after: Number of nanoseconds to run before pausing again (optional).
         """
+        # Cleared before the request, so a sim:pause event triggered by `pause_after` wins
+        self._paused = False
         await resume(self._transport, pause_after)
 
     async def wait_until_simulation_time(self, seconds: float) -> None:
         """
         Pause and resume the simulation until the given simulation time (in seconds) is reached.
 
+        If the simulation is already paused at or past the given time, this returns
+        without contacting the simulator.
+
         Args:
             seconds: The simulation time to wait for, in seconds.
-        """
-        await pause(self._transport)
-        remaining_nanos = seconds * 1e9 - self.last_pause_nanos
-        if remaining_nanos > 0:
-            if self._pause_queue is None:
-                self._pause_queue = EventQueue(self._transport, "sim:pause")
-            self._pause_queue.flush()
-            await resume(self._transport, int(remaining_nanos))
-            await self._pause_queue.get()
+
+        Raises:
+            WokwiError: If the client is not connected.
+        """
+        pause_queue = self._pause_queue  # created by connect(), cleared by disconnect()
+        if pause_queue is None:
+            raise WokwiError("Not connected")
+        if not self._paused:
+            await pause(self._transport)
+            self._paused = True
+        # Integer nanoseconds, so large simulation times don't lose precision to floats
+        remaining_nanos = round(seconds * 1_000_000_000) - self.last_pause_nanos
+        if remaining_nanos <= 0:
+            return
+        pause_queue.flush()
+        self._paused = False
+        await resume(self._transport, remaining_nanos)
+        await pause_queue.get()
 
     async def restart_simulation(self, pause: bool = False) -> None:
         """
@@ -228,6 +317,8 @@ class WokwiClient:
             pause: Whether to start the simulation paused (default: False).
         """
         await restart(self._transport, pause)
+        self.last_pause_nanos = 0
+        self._paused = pause
 
     def serial_monitor(self, callback: Callable[[bytes], Any]) -> asyncio.Task[None]:
         """
@@ -242,23 +333,33 @@ class WokwiClient:
             task.cancel()
         """
 
-        async def _runner() -> None:
-            try:
-                async for line in monitor_lines(self._transport):
-                    try:
-                        result = callback(line)
-                        if inspect.isawaitable(result):
-                            await result
-                    except Exception:
-                        # Swallow callback exceptions to keep the monitor alive.
-                        # Users can add their own error handling inside the callback.
-                        pass
-            finally:
-                # Clean up task from the set when it completes
-                self._serial_monitor_tasks.discard(task)
-
-        task = asyncio.create_task(_runner(), name="wokwi-serial-monitor")
+        async def _run_async() -> None:
+            async for line in monitor_lines(self._transport):
+                try:
+                    await callback(line)
+                except Exception:
+                    # Swallow callback exceptions to keep the monitor alive.
+                    # Users can add their own error handling inside the callback.
+                    pass
+
+        async def _run_sync() -> None:
+            async for line in monitor_lines(self._transport):
+                try:
+                    result = callback(line)
+                    # A plain function may still return an awaitable (e.g. a lambda calling
+                    # an async function); the usual None result skips the check
+                    if result is not None and inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    pass
+
+        # Pick the loop once, instead of checking the kind of callback on every line
+        runner = _run_async if inspect.iscoroutinefunction(callback) else _run_sync
+        task = asyncio.create_task(runner(), name="wokwi-serial-monitor")
+        # The set holds the strong reference that keeps the task alive (the event loop only
+        # keeps a weak one); the task removes itself from it once it is done
         self._serial_monitor_tasks.add(task)
+        task.add_done_callback(self._serial_monitor_tasks.discard)
         return task
 
     def stop_serial_monitors(self) -> None:
@@ -268,35 +369,97 @@ class WokwiClient:
         This method cancels all tasks created by the serial_monitor method.
         After calling this method, all active serial monitors will stop receiving data.
         """
-        for task in self._serial_monitor_tasks.copy():
+        # cancel() doesn't run the done callbacks right away, so the set can't change under us
+        for task in self._serial_monitor_tasks:
             task.cancel()
         self._serial_monitor_tasks.clear()
 
-    async def serial_monitor_cat(self, decode_utf8: bool = True, errors: str = "replace") -> None:
+    async def serial_monitor_cat(
+        self, decode_utf8: bool | None = None, errors: str = "replace"
+    ) -> None:
         """
         Print serial monitor output to stdout as it is received from the simulation.
 
+        Output is batched: it is written to stdout once 4 KiB have accumulated, or 10 ms
+        after the first pending line, whichever comes first.
+
         Args:
-            decode_utf8: Whether to decode bytes as UTF-8. If False, prints raw bytes (default: True).
+            decode_utf8: Whether to decode bytes as UTF-8. If False, writes the raw bytes. By
+                default, output is decoded only when stdout is a terminal, and passed through
+                as raw bytes when it is redirected to a file or pipe.
             errors: How to handle UTF-8 decoding errors. Options: 'strict', 'ignore', 'replace' (default: 'replace').
         """
-        async for line in monitor_lines(self._transport):
-            if decode_utf8:
-                try:
-                    output = line.decode("utf-8", errors=errors)
-                    print(output, end="", flush=True)
-                except UnicodeDecodeError:
-                    # Fallback to raw bytes if decoding fails completely
-                    print(line, end="", flush=True)
-            else:
-                print(line, end="", flush=True)
-
-    async def serial_write(self, data: Union[bytes, str, list[int]]) -> None:
+        writer = StdoutWriter(decode_utf8, errors)
+        write = writer.write  # bound once, not looked up per line
+        try:
+            async for payload in monitor_payloads(self._transport):
+                write(payload)
+        finally:
+            writer.close()
+
+    async def serial_write(self, data: bytes | str | list[int]) -> None:
         """Write data to the simulation serial monitor interface."""
-        await write_serial(self._transport, data)
+        if type(data) is bytes:  # the common case, exact check keeps it cheap
+            await write_serial_bytes(self._transport, data)
+        else:
+            await write_serial(self._transport, data)
+
+    def serial_write_buffered(self, data: bytes | str | list[int]) -> None:
+        """
+        Queue data for the serial monitor interface, to be sent along with other writes.
+
+        Unlike `serial_write()`, this returns right away: everything written within
+        5 ms of the first buffered write goes out as a single serial-monitor:write
+        command, instead of one round-trip per call. Call `flush_serial()` to send the
+        buffer immediately, and to get any error. Must be called on the event loop.
+        """
+        if isinstance(data, str):
+            self._serial_out += data.encode("utf-8")
+        elif isinstance(data, (bytes, bytearray)):
+            self._serial_out += data
+        else:
+            # bytes() rejects values outside 0-255, like serial_write() does
+            self._serial_out += bytes(data)
+        if self._serial_flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._serial_flush_handle = loop.call_later(
+                _SERIAL_WRITE_DELAY, self._start_serial_flush
+            )
+
+    def _start_serial_flush(self) -> None:
+        self._serial_flush_handle = None
+        # Chained to the previous write, so data goes out in order and a failure is passed
+        # on until an explicit flush_serial() reports it
+        task = asyncio.create_task(self._send_serial_out(self._serial_flush_task))
+        task.add_done_callback(_consume_exception)
+        self._serial_flush_task = task
+
+    async def _send_serial_out(self, previous: asyncio.Task[None] | None) -> None:
+        if previous is not None:
+            await previous
+        if not self._serial_out:
+            return
+        data = bytes(self._serial_out)
+        self._serial_out.clear()
+        await write_serial_bytes(self._transport, data)
+
+    async def flush_serial(self) -> None:
+        """
+        Send the data buffered by `serial_write_buffered()` now.
+
+        This waits for any write already started by the 5 ms timer, and raises its
+        error, if it failed. The data that was still buffered is kept in that case.
+        """
+        if self._serial_flush_handle is not None:
+            self._serial_flush_handle.cancel()
+            self._serial_flush_handle = None
+        previous = self._serial_flush_task
+        self._serial_flush_task = None
+        await self._send_serial_out(previous)
 
     def _on_pause(self, event: EventMessage) -> None:
         self.last_pause_nanos = int(event["nanos"])
+        self._paused = True
 
     async def read_pin(self, part: str, pin: str) -> PinReadMessage:
         """Read the current state of a pin.
@@ -308,6 +471,21 @@ class WokwiClient:
         pin_data = await pin_read(self._transport, part=part, pin=pin)
         return cast(PinReadMessage, pin_data["result"])
 
+    async def read_pins(self, pins: Sequence[tuple[str, str]]) -> list[PinReadMessage]:
+        """Read the current state of several pins at once.
+
+        All requests are sent before waiting for any response, so this takes a single
+        round-trip instead of one per pin.
+
+        Args:
+            pins: (part, pin) pairs, e.g. [("uno", "A2"), ("uno", "13")].
+
+        Returns:
+            The pin states, in the same order as `pins`.
+        """
+        responses = await pin_read_many(self._transport, pins)
+        return cast(list[PinReadMessage], [response["result"] for response in responses])
+
     async def listen_pin(self, part: str, pin: str, listen: bool = True) -> None:
         """Start or stop listening for changes on a pin.
 
@@ -321,6 +499,17 @@ class WokwiClient:
         """
         await pin_listen(self._transport, part=part, pin=pin, listen=listen)
 
+    async def listen_pins(self, pins: Sequence[tuple[str, str]], listen: bool = True) -> None:
+        """Start or stop listening for changes on several pins at once.
+
+        All requests are sent before waiting for any response, like `read_pins()`.
+
+        Args:
+            pins: (part, pin) pairs, e.g. [("uno", "A2"), ("uno", "13")].
+            listen: True to start listening, False to stop.
+        """
+        await pin_listen_many(self._transport, pins, listen)
+
     async def gpio_list(self) -> list[str]:
         """Get a list of all GPIO pins available in the simulation.
 
@@ -333,7 +522,7 @@ class WokwiClient:
             raise ProtocolError("Malformed gpio:list response: expected result.pins: list[str]")
         return cast(list[str], pins_val)
 
-    async def set_control(self, part: str, control: str, value: Union[int, bool, float]) -> None:
+    async def set_control(self, part: str, control: str, value: int | bool | float) -> None:
         """Set a control value (e.g. simulate button press).
 
         Args:
@@ -343,13 +532,21 @@ class WokwiClient:
         """
         await set_control(self._transport, part=part, control=control, value=value)
 
+    async def set_controls(self, controls: Sequence[tuple[str, str, int | bool | float]]) -> None:
+        """Set several control values at once, in a single round-trip (see `read_pins`).
+
+        Args:
+            controls: (part, control, value) tuples, e.g. [("btn1", "pressed", 1)].
+        """
+        await set_control_many(self._transport, controls)
+
     async def touch_event(
         self,
         part: str,
         x: float,
         y: float,
         event: str,
-        release_after: Optional[int] = None,
+        release_after: int | None = None,
     ) -> None:
         """Send a touch event to a part with a touchscreen.
 
@@ -378,6 +575,10 @@ class WokwiClient:
         """Save the current framebuffer as a PNG file."""
         return await save_framebuffer_png(self._transport, id=id, path=path, overwrite=overwrite)
 
+    async def compare_framebuffer_png(self, id: str, reference: Path) -> bool:
+        """Return True if the current framebuffer matches the reference PNG file exactly."""
+        return await compare_framebuffer_png(self._transport, id=id, reference=reference)
+
     async def read_vcd(self) -> VCDData:
         """Read logic analyzer data as VCD (Value Change Dump).
 
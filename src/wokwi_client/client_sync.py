@@ -14,58 +14,121 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import inspect
 import threading
-from collections.abc import Coroutine
-from concurrent.futures import Future
+from collections.abc import Coroutine, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Any, Callable, TypeVar
 
 from .client import WokwiClient
-from .serial import monitor_lines
+from .runner import new_event_loop
+from .serial import StdoutWriter, monitor_lines, monitor_payloads
 
 T = TypeVar("T")
 
 
+class _SharedLoop:
+    """An event loop running on a daemon thread, shared by all WokwiClientSync instances.
+
+    The loop and its thread are started by the first client and reference-counted, so
+    further clients don't pay for a thread and loop of their own. The loop is stopped
+    when the last client disconnects. uvloop and asyncio clients get separate loops.
+    """
+
+    _lock = threading.Lock()
+    _instances: dict[bool, _SharedLoop] = {}
+
+    def __init__(self, use_uvloop: bool) -> None:
+        self.use_uvloop = use_uvloop
+        self.refs = 0
+        self.loop = new_event_loop(use_uvloop)
+        self.thread = threading.Thread(target=self._run, daemon=True, name="wokwi-sync-loop")
+        self.thread.start()
+        # **Wait until loop is fully started before proceeding** (prevents race conditions):
+        # a no-op coroutine can only complete once the loop runs, and it takes the same
+        # path as every later call, no separate Event needed
+        try:
+            ready = asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop)
+            ready.result(timeout=8.0)  # timeout to avoid deadlock
+        except FutureTimeoutError:
+            raise RuntimeError("WokwiClientSync event loop failed to start") from None
+
+    def _run(self) -> None:
+        """Target function for the background thread: runs the asyncio event loop."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @classmethod
+    def acquire(cls, use_uvloop: bool) -> _SharedLoop:
+        with cls._lock:
+            shared = cls._instances.get(use_uvloop)
+            if shared is None:
+                shared = cls._instances[use_uvloop] = cls(use_uvloop)
+            shared.refs += 1
+            return shared
+
+    def release(self) -> None:
+        with self._lock:
+            self.refs -= 1
+            if self.refs > 0:
+                return
+            del self._instances[self.use_uvloop]
+        # Last client gone: stop loop / join thread, then close the loop
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5.0)
+        with contextlib.suppress(Exception):
+            self.loop.close()
+
+
 class WokwiClientSync:
     """
     Synchronous client for the Wokwi Simulation API.
 
     Design:
-      • A private asyncio loop runs on a dedicated background thread.
+      • An asyncio loop runs on a dedicated background thread, shared by all
+        instances (see `_SharedLoop`).
       • Public methods mirror the async API by submitting the underlying
         coroutine calls onto that loop and waiting for results (blocking).
       • Long-lived streamers (serial monitors) are scheduled on the loop and
         tracked, so we can cancel & drain them on `disconnect()`.
     """
 
-    def __init__(self, token: str, server: str | None = None):
-        # Create a new event loop for the background thread
-        self._loop = asyncio.new_event_loop()
-        # Event to signal that the event loop is running
-        self._loop_started_event = threading.Event()
-        # Start background thread running the event loop
-        self._thread = threading.Thread(
-            target=self._run_loop, args=(self._loop,), daemon=True, name="wokwi-sync-loop"
-        )
-        self._thread.start()
-        # **Wait until loop is fully started before proceeding** (prevents race conditions)
-        if not self._loop_started_event.wait(timeout=8.0):  # timeout to avoid deadlock
-            raise RuntimeError("WokwiClientSync event loop failed to start")
+    __slots__ = (
+        "_shared_loop",
+        "_loop",
+        "_async_client",
+        "_bg_tasks",
+        "_callback_executor",
+        "_closed",
+    )
+
+    def __init__(self, token: str, server: str | None = None, use_uvloop: bool = False):
+        """
+        Initialize the WokwiClientSync.
+
+        Args:
+            token: API token for authentication (get from https://wokwi.com/dashboard/ci).
+            server: Optional custom server URL. Defaults to the public Wokwi server.
+            use_uvloop: Run the background event loop on uvloop, if it is installed
+                (`pip install wokwi-client[fast]`, not available on Windows).
+        """
+        # Join the background event loop (started on first use)
+        self._shared_loop = _SharedLoop.acquire(use_uvloop)
+        self._loop = self._shared_loop.loop
         # Initialize underlying async client on the running loop
         self._async_client = WokwiClient(token, server)
         # Track background monitor tasks (futures) for cancellation on exit
-        self._bg_futures: set[Future[Any]] = set()
+        # (only ever touched on the loop thread, so it needs no lock)
+        self._bg_tasks: set[asyncio.Task[None]] = set()
+        # Runs sync serial monitor callbacks (a single worker keeps lines in order)
+        self._callback_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wokwi-sync-callback"
+        )
         # Flag to avoid double-closing
         self._closed = False
 
-    def _run_loop(self, loop: asyncio.AbstractEventLoop) -> None:
-        """Target function for the background thread: runs the asyncio event loop."""
-        asyncio.set_event_loop(loop)
-        # Signal that the loop is now running and ready to accept tasks
-        loop.call_soon(self._loop_started_event.set)
-        loop.run_forever()
-
     # ----- Internal helpers -------------------------------------------------
     def _submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
         """Submit a coroutine to the loop and return its concurrent.futures.Future."""
@@ -74,13 +137,73 @@ class WokwiClientSync:
     def _call(self, coro: Coroutine[Any, Any, T]) -> T:
         """Submit a coroutine to the background loop and wait for result."""
         if self._closed:
+            coro.close()  # never scheduled, avoid a "never awaited" warning
             raise RuntimeError("Cannot call methods on a closed WokwiClientSync")
+        if threading.current_thread() is self._shared_loop.thread:
+            # Blocking here would wait on the very loop that has to run the coroutine
+            coro.close()
+            raise RuntimeError(
+                "Cannot make blocking WokwiClientSync calls from its event loop thread "
+                "(e.g. from an async serial monitor callback)"
+            )
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return future.result()  # Block until the coroutine completes or raises
 
-    def _add_bg_future(self, fut: Future[Any]) -> None:
-        """Track a background future so we can cancel & drain on shutdown."""
-        self._bg_futures.add(fut)
+    def _call_many(self, coros: Iterable[Coroutine[Any, Any, T]]) -> list[T]:
+        """Run several coroutines concurrently on the background loop and wait for all.
+
+        The calling thread hands over and waits for the loop once for the whole group,
+        instead of once per coroutine, and the requests are pipelined on the websocket.
+        Results are returned in order; the first exception is raised.
+        """
+        coros = list(coros)
+
+        async def _gather() -> list[T]:
+            return list(await asyncio.gather(*coros))
+
+        return self._call(_gather())
+
+    def _start_bg_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Start a long-running coroutine (e.g. a serial monitor) on the loop and track it."""
+
+        def _start() -> None:  # runs on the loop thread
+            task = self._loop.create_task(coro)
+            self._bg_tasks.add(task)
+            task.add_done_callback(self._bg_tasks.discard)
+
+        self._loop.call_soon_threadsafe(_start)
+
+    def _cancel_bg_tasks(self) -> list[asyncio.Task[None]]:
+        """Cancel all background tasks and return them. Must run on the loop thread."""
+        tasks = list(self._bg_tasks)
+        for task in tasks:
+            task.cancel()
+        return tasks
+
+    async def _shutdown(self) -> None:
+        """Cancel all background tasks and disconnect, concurrently, with one deadline."""
+        tasks = self._cancel_bg_tasks()
+        await asyncio.wait_for(
+            asyncio.gather(*tasks, self._async_client.disconnect(), return_exceptions=True),
+            timeout=3.0,
+        )
+
+    def batch(self) -> _Batch:
+        """
+        Queue up several calls and run them together, paying for one round-trip.
+
+        Inside the `with` block, calls on the batch (any `WokwiClient` coroutine
+        method, e.g. `read_pin` or `set_control`) are only recorded. On exit they
+        are sent concurrently and awaited together; the results are then available
+        in call order as `batch.results`. If the block raises, nothing is sent.
+
+        Example:
+            with client.batch() as batch:
+                batch.set_control("btn1", "pressed", 1)
+                batch.read_pin("esp", "D2")
+            pin_state = batch.results[1]
+        """
+        return _Batch(self)
 
     # ----- Context manager sugar -------------------------------------------
     def __enter__(self) -> WokwiClientSync:
@@ -92,37 +215,40 @@ class WokwiClientSync:
 
     # ----- Lifecycle --------------------------------------------------------
     def connect(self) -> dict[str, Any]:
-        """Connect to the simulator (blocking) and return server info."""
+        """
+        Connect to the simulator (blocking) and return server info.
+
+        A disconnected client can connect again; it keeps its underlying `WokwiClient`.
+        """
+        if self._closed:
+            self._reopen()
         return self._call(self._async_client.connect())
 
+    def _reopen(self) -> None:
+        """Take back the resources `disconnect()` released, for another connection."""
+        self._shared_loop = _SharedLoop.acquire(self._shared_loop.use_uvloop)
+        self._loop = self._shared_loop.loop
+        self._callback_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wokwi-sync-callback"
+        )
+        self._closed = False
+
     def disconnect(self) -> None:
         if self._closed:
             return
 
-        # (1) Cancel + drain monitors
-        for fut in list(self._bg_futures):
-            fut.cancel()
-        for fut in list(self._bg_futures):
-            with contextlib.suppress(FutureTimeoutError, Exception):
-                fut.result(timeout=1.0)
-            self._bg_futures.discard(fut)
-
-        # (2) Disconnect transport
+        # (1) Cancel + drain monitors and disconnect transport, in one trip to the loop
+        #     (the extra second covers a loop too busy to even start the shutdown)
         with contextlib.suppress(Exception):
-            fut = asyncio.run_coroutine_threadsafe(self._async_client.disconnect(), self._loop)
-            fut.result(timeout=2.0)
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=4.0)
 
-        # (3) Stop loop / join thread
-        if self._loop.is_running():
-            self._loop.call_soon_threadsafe(self._loop.stop)
-        if self._thread.is_alive():
-            self._thread.join(timeout=5.0)
+        # Monitors are cancelled, so no new callbacks can be submitted
+        self._callback_executor.shutdown(wait=False)
 
-        # (4) Close loop
-        with contextlib.suppress(Exception):
-            self._loop.close()
+        # (2) Release the shared loop (stopped once the last client is done with it)
+        self._shared_loop.release()
 
-        # (5) Mark closed at the very end
+        # (3) Mark closed at the very end
         self._closed = True
 
     # ----- Serial monitoring ------------------------------------------------
@@ -131,87 +257,161 @@ class WokwiClientSync:
         Start monitoring the serial output in the background and invoke `callback`
         for each line. Non-blocking. Runs until `disconnect()`.
 
-        The callback may be sync or async. Exceptions raised by the callback are
-        swallowed to keep the monitor alive (add your own logging as needed).
+        The callback may be sync or async. Sync callbacks run one line at a time, in
+        order, on a worker thread, so a slow callback doesn't stall the event loop and
+        may itself call blocking methods of this client. Exceptions raised by the
+        callback are swallowed to keep the monitor alive (add your own logging as needed).
         """
 
-        async def _runner() -> None:
-            try:
-                # **Prepare to receive serial events before enabling monitor**
-                # (monitor_lines will subscribe to serial events internally)
-                async for line in monitor_lines(self._async_client._transport):
-                    try:
-                        result = callback(line)  # invoke callback with the raw bytes line
-                        if inspect.isawaitable(result):
-                            await result  # await if callback is async
-                    except Exception:
-                        # Swallow exceptions from callback to keep monitor alive
-                        pass
-            finally:
-                # Remove this task’s future from the set when done
-                self._bg_futures.discard(task_future)
-
+        # Bound once as locals, so the per-line loops do no attribute lookups
+        run_in_executor = self._loop.run_in_executor
+        executor = self._callback_executor
+        transport = self._async_client._transport
+
+        async def _run_async() -> None:
+            # **Prepare to receive serial events before enabling monitor**
+            # (monitor_lines will subscribe to serial events internally)
+            async for line in monitor_lines(transport):
+                try:
+                    await callback(line)  # invoke callback with the raw bytes line
+                except Exception:
+                    # Swallow exceptions from callback to keep monitor alive
+                    pass
+
+        async def _run_sync() -> None:
+            async for line in monitor_lines(transport):
+                try:
+                    # run_in_executor() with the bare function: unlike to_thread(), it
+                    # doesn't copy the context for every line
+                    result = await run_in_executor(executor, callback, line)
+                    if result is not None and inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    pass
+
+        # Pick the loop once, instead of checking the kind of callback on every line
+        runner = _run_async if inspect.iscoroutinefunction(callback) else _run_sync
         # Schedule the serial monitor runner on the event loop:
-        task_future = asyncio.run_coroutine_threadsafe(_runner(), self._loop)
-        self._bg_futures.add(task_future)
+        self._start_bg_task(runner())
         # (No return value; monitoring happens in background)
 
-    def serial_monitor_cat(self, decode_utf8: bool = True, errors: str = "replace") -> None:
+    def serial_monitor_cat(self, decode_utf8: bool | None = None, errors: str = "replace") -> None:
         """
         Print serial monitor output in the background (non-blocking). Runs until `disconnect()`.
 
+        Output is batched like `WokwiClient.serial_monitor_cat()`.
+
         Args:
-            decode_utf8: Whether to decode bytes as UTF-8 (default True).
+            decode_utf8: Whether to decode bytes as UTF-8 (default: only when stdout is a
+                terminal, raw bytes otherwise).
             errors: UTF-8 decoding error strategy ('strict'|'ignore'|'replace').
         """
 
         async def _runner() -> None:
+            # Batch the output into few stdout writes instead of a flushed print per line
+            writer = StdoutWriter(decode_utf8, errors)
+            write = writer.write
             try:
                 # **Subscribe to serial events before reading output**
-                async for line in monitor_lines(self._async_client._transport):
+                async for payload in monitor_payloads(self._async_client._transport):
                     try:
-                        if decode_utf8:
-                            # Decode bytes to string (handle errors per parameter)
-                            text = line.decode("utf-8", errors=errors)
-                            print(text, end="", flush=True)
-                        else:
-                            # Print raw bytes
-                            print(line, end="", flush=True)
+                        write(payload)
                     except Exception:
                         # Swallow print errors to keep stream alive
                         pass
             finally:
-                self._bg_futures.discard(task_future)
+                with contextlib.suppress(Exception):
+                    writer.close()
 
-        task_future = asyncio.run_coroutine_threadsafe(_runner(), self._loop)
-        self._bg_futures.add(task_future)
+        self._start_bg_task(_runner())
         # (No return; printing continues in background)
 
     def stop_serial_monitors(self) -> None:
         """Stop all active serial monitor background tasks."""
-        for fut in list(self._bg_futures):
-            fut.cancel()
-        self._bg_futures.clear()
+        if self._closed:
+            # disconnect() already stopped them, and the loop may be closed by now
+            return
+        self._loop.call_soon_threadsafe(self._cancel_bg_tasks)
+
+    def serial_write_buffered(self, data: bytes | str | list[int]) -> None:
+        """
+        Queue data for the serial monitor interface (non-blocking).
+
+        Writes within 5 ms of each other are sent as one command, see
+        `WokwiClient.serial_write_buffered()`. Use `flush_serial()` to send them now.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot call methods on a closed WokwiClientSync")
+        if isinstance(data, list):
+            # Convert here, so invalid values raise in the caller instead of on the loop
+            data = bytes(data)
+        self._loop.call_soon_threadsafe(self._async_client.serial_write_buffered, data)
 
     # ----- Dynamic method wrapping -----------------------------------------
     def __getattr__(self, name: str) -> Any:
         """
         Delegate attribute access to the underlying async client.
 
-        If the attribute on `WokwiClient` is a coroutine function, return a
-        sync wrapper that blocks until the coroutine completes.
+        Coroutine methods never get here, they have sync wrappers defined on the
+        class (see `_add_sync_wrappers`); this only serves plain attributes such as
+        `version` or `last_pause_nanos`.
         """
-        # Explicit methods (like serial_monitor functions above) take precedence over __getattr__
-        attr = getattr(self._async_client, name)
-        if callable(attr):
-            # Get the function object from WokwiClient class (unbound) to check if coroutine
-            func = getattr(WokwiClient, name, None)
-            if func is not None and inspect.iscoroutinefunction(func):
-                # Wrap coroutine method to run in background loop
-                def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-                    return self._call(attr(*args, **kwargs))
-
-                sync_wrapper.__name__ = name
-                sync_wrapper.__doc__ = getattr(func, "__doc__", "")
-                return sync_wrapper
-        return attr
+        return getattr(self._async_client, name)
+
+
+class _Batch:
+    """Records `WokwiClient` calls and runs them in one go on exit (see `WokwiClientSync.batch`)."""
+
+    __slots__ = ("_client", "_coros", "results")
+
+    def __init__(self, client: WokwiClientSync) -> None:
+        self._client = client
+        self._coros: list[Coroutine[Any, Any, Any]] = []
+        self.results: list[Any] = []
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        func = vars(WokwiClient).get(name)
+        if not inspect.iscoroutinefunction(func):
+            raise AttributeError(f"{name!r} can't be used in a batch")
+
+        def queue(*args: Any, **kwargs: Any) -> None:
+            # Creating the coroutine runs none of its code; that happens on the loop
+            self._coros.append(func(self._client._async_client, *args, **kwargs))
+
+        return queue
+
+    def __enter__(self) -> _Batch:
+        return self
+
+    def __exit__(self, exc_type: type | None, exc_val: BaseException | None, exc_tb: Any) -> None:
+        coros, self._coros = self._coros, []
+        if exc_type is not None:
+            for coro in coros:
+                coro.close()  # never scheduled, avoid "never awaited" warnings
+            return
+        self.results = self._client._call_many(coros)
+
+
+def _make_sync_wrapper(func: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Any]:
+    """Wrap a `WokwiClient` coroutine method so it runs on the background loop and blocks."""
+
+    @functools.wraps(func)
+    def sync_wrapper(self: WokwiClientSync, *args: Any, **kwargs: Any) -> Any:
+        return self._call(func(self._async_client, *args, **kwargs))
+
+    return sync_wrapper
+
+
+def _add_sync_wrappers() -> None:
+    """Define a blocking method on WokwiClientSync for every coroutine method of WokwiClient.
+
+    Done once at import, so calls go straight to the wrapper instead of through
+    `__getattr__` and `inspect` every time.
+    """
+    for name, func in vars(WokwiClient).items():
+        # Explicit methods (like serial_monitor functions above) take precedence
+        if inspect.iscoroutinefunction(func) and name not in vars(WokwiClientSync):
+            setattr(WokwiClientSync, name, _make_sync_wrapper(func))
+
+
+_add_sync_wrappers()
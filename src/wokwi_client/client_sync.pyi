@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import Any, Callable
 
@@ -9,6 +10,15 @@ from .vcd import VCDData
 
 __all__ = ["WokwiClientSync"]
 
+class _Batch:
+    results: list[Any]
+
+    def __getattr__(self, name: str) -> Callable[..., None]: ...
+    def __enter__(self) -> _Batch: ...
+    def __exit__(
+        self, exc_type: type | None, exc_val: BaseException | None, exc_tb: Any
+    ) -> None: ...
+
 class WokwiClientSync:
     """
     Synchronous client for the Wokwi Simulation API.
@@ -21,7 +31,7 @@ class WokwiClientSync:
     version: str
     last_pause_nanos: int
 
-    def __init__(self, token: str, server: str | None = None) -> None: ...
+    def __init__(self, token: str, server: str | None = None, use_uvloop: bool = False) -> None: ...
 
     # Context manager
     def __enter__(self) -> WokwiClientSync: ...
@@ -33,12 +43,18 @@ class WokwiClientSync:
 
     # Serial monitoring (non-blocking background tasks managed internally)
     def serial_monitor(self, callback: Callable[[bytes], Any]) -> None: ...
-    def serial_monitor_cat(self, decode_utf8: bool = True, errors: str = "replace") -> None: ...
+    def serial_monitor_cat(
+        self, decode_utf8: bool | None = None, errors: str = "replace"
+    ) -> None: ...
     def stop_serial_monitors(self) -> None: ...
 
+    # Batching: calls recorded in the block run concurrently on exit
+    def batch(self) -> _Batch: ...
+
     # Methods mirrored from WokwiClient (sync variants)
-    def upload(self, name: str, content: bytes) -> None: ...
+    def upload(self, name: str, content: bytes | bytearray | memoryview) -> None: ...
     def upload_file(self, filename: str, local_path: Path | None = None) -> str: ...
+    def upload_many(self, files: Mapping[str, bytes | bytearray | memoryview | Path]) -> None: ...
     def upload_idf_firmware(self, flasher_args_path: str | Path) -> IdfFirmwareUploadResult: ...
     def download(self, name: str) -> bytes: ...
     def download_file(self, name: str, local_path: Path | None = None) -> None: ...
@@ -47,7 +63,7 @@ class WokwiClientSync:
         firmware: str | list[FlashSection] | None = None,
         elf: str | None = None,
         pause: bool = False,
-        chips: list[str] = ...,  # default empty list at runtime
+        chips: Sequence[str] | None = None,
         flash_size: int | None = None,
     ) -> None: ...
     def pause_simulation(self) -> None: ...
@@ -55,11 +71,17 @@ class WokwiClientSync:
     def wait_until_simulation_time(self, seconds: float) -> None: ...
     def restart_simulation(self, pause: bool = False) -> None: ...
     def serial_write(self, data: bytes | str | list[int]) -> None: ...
+    def serial_write_buffered(self, data: bytes | str | list[int]) -> None: ...
+    def flush_serial(self) -> None: ...
     def read_pin(self, part: str, pin: str) -> PinReadMessage: ...
+    def read_pins(self, pins: Sequence[tuple[str, str]]) -> list[PinReadMessage]: ...
     def listen_pin(self, part: str, pin: str, listen: bool = True) -> None: ...
+    def listen_pins(self, pins: Sequence[tuple[str, str]], listen: bool = True) -> None: ...
     def gpio_list(self) -> list[str]: ...
     def set_control(self, part: str, control: str, value: int | bool | float) -> None: ...
+    def set_controls(self, controls: Sequence[tuple[str, str, int | bool | float]]) -> None: ...
     def read_framebuffer_png_bytes(self, id: str) -> bytes: ...
     def save_framebuffer_png(self, id: str, path: Path, overwrite: bool = True) -> Path: ...
+    def compare_framebuffer_png(self, id: str, reference: Path) -> bool: ...
     def read_vcd(self) -> VCDData: ...
     def save_vcd(self, path: Path, overwrite: bool = True) -> VCDData: ...
@@ -11,6 +11,9 @@ Assumptions:
 #
 # SPDX-License-Identifier: MIT
 
+import functools
+import math
+from collections.abc import Sequence
 from typing import Union
 
 from .protocol_types import ResponseMessage
@@ -28,6 +31,40 @@ async def set_control(
         control: Control name (e.g. "pressed").
         value: Control value to set (float).
     """
-    return await transport.request(
-        "control:set", {"part": part, "control": control, "value": float(value)}
+    return await transport.request_template(_control_template(part, control, float(value)))
+
+
+async def set_control_many(
+    transport: Transport, controls: Sequence[tuple[str, str, Union[int, bool, float]]]
+) -> list[ResponseMessage]:
+    """Set several control values, sending all commands before awaiting any response.
+
+    Args:
+        transport: Active Transport.
+        controls: (part, control, value) tuples.
+    """
+    return await transport.request_template_many(
+        [_control_template(part, control, float(value)) for part, control, value in controls]
+    )
+
+
+def _control_template(part: str, control: str, value: float) -> str:
+    if not math.isfinite(value):  # no JSON literal for these, leave them to the encoder
+        return Transport.command_template(
+            "control:set", {"part": part, "control": control, "value": value}
+        )
+    # The value is spliced in as its repr(), which is how JSON encoders write floats
+    prefix, suffix = _control_frame_parts(part, control)
+    return prefix + repr(value) + suffix
+
+
+@functools.lru_cache(maxsize=256)
+def _control_frame_parts(part: str, control: str) -> tuple[str, str]:
+    # Encode the frame for each control once, with a placeholder value, and keep the text
+    # around it; unlike caching whole frames, this also covers sweeps over many values
+    template = Transport.command_template(
+        "control:set", {"part": part, "control": control, "value": 0.0}
     )
+    # The value is the last field of the params, which are the last field of the frame
+    prefix, _, suffix = template.rpartition("0.0")
+    return prefix, suffix
@@ -14,25 +14,72 @@ Usage:
 """
 
 import asyncio
+import contextlib
+from collections import deque
+from typing import Literal
 
 from .protocol_types import EventMessage
 from .transport import Transport
 
 
 class EventQueue:
-    """A queue for events from a specific event type."""
+    """A queue for events from a specific event type.
 
-    def __init__(self, transport: Transport, event_type: str) -> None:
+    Events are kept in a plain deque, and waiting `get()` calls are woken through futures
+    queued in arrival order. There is no putter side to track (putting never blocks), so
+    this skips most of `asyncio.Queue`'s bookkeeping, while still allowing several
+    concurrent consumers.
+
+    By default the queue is unbounded. With `maxsize`, at most that many events are kept
+    when the consumer falls behind: further events are dropped (`on_overflow="drop_new"`),
+    or replace the oldest queued event (`on_overflow="drop_oldest"`).
+    """
+
+    __slots__ = ("_loop", "_events", "_waiters", "_transport", "_event_type", "_listener")
+
+    def __init__(
+        self,
+        transport: Transport,
+        event_type: str,
+        maxsize: int = 0,
+        on_overflow: Literal["drop_new", "drop_oldest"] = "drop_new",
+    ) -> None:
         # Bind the queue to the current running loop (important for py3.9)
         self._loop = asyncio.get_running_loop()
-        self._queue: asyncio.Queue[EventMessage] = asyncio.Queue()
+        bounded = maxsize > 0
+        # A deque with maxlen discards from the other end by itself: that is drop_oldest
+        events: deque[EventMessage] = deque(
+            maxlen=maxsize if bounded and on_overflow == "drop_oldest" else None
+        )
+        self._events = events
+        self._waiters: deque[asyncio.Future[None]] = deque()
         self._transport = transport
         self._event_type = event_type
 
+        loop = self._loop
+        drop_new = bounded and on_overflow == "drop_new"
+
+        def put_nowait(event: EventMessage) -> None:
+            # A full queue drops an event, rather than raising into the transport
+            if drop_new and len(events) >= maxsize:
+                return
+            events.append(event)
+            if self._waiters:
+                self._wake_next()
+
         def listener(event: EventMessage) -> None:
-            # Ensure we enqueue on the loop that owns the queue, even if
-            # the listener is invoked from a different loop/thread.
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+            # The transport normally dispatches on the loop that owns the queue: enqueue
+            # directly, skipping call_soon_threadsafe()'s lock and loop wake-up
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                put_nowait(event)
+            else:
+                # Ensure we enqueue on the loop that owns the queue, even if
+                # the listener is invoked from a different loop/thread.
+                loop.call_soon_threadsafe(put_nowait, event)
 
         self._listener = listener
         self._transport.add_event_listener(self._event_type, self._listener)
@@ -41,18 +88,41 @@ class EventQueue:
         """Close the queue. This is useful when you want to stop listening for events."""
         self._transport.remove_event_listener(self._event_type, self._listener)
 
+    def _wake_next(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
     async def get(self) -> EventMessage:
         """Get an event from the queue. Blocks until an event is available."""
-        return await self._queue.get()
+        events = self._events
+        while not events:
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+                # Hand a wake-up meant for this (cancelled) getter on to the next one
+                if events:
+                    self._wake_next()
+                raise
+        return events.popleft()
 
     def get_nowait(self) -> EventMessage:
         """Get an event from the queue. Raises QueueEmpty if no event is available."""
-        return self._queue.get_nowait()
+        if not self._events:
+            raise asyncio.QueueEmpty
+        return self._events.popleft()
 
     def flush(self) -> None:
         """Flush the queue. This is useful when you want to wait for all events to be processed."""
-        while not self._queue.empty():
-            self._queue.get_nowait()
+        self._events.clear()
 
     def __enter__(self) -> "EventQueue":
         return self
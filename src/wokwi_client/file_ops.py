@@ -2,13 +2,16 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
+import binascii
+import re
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from wokwi_client.idf import resolveIdfFirmware
 
-from .models import UploadParams
 from .protocol_types import ResponseMessage
 from .transport import Transport
 
@@ -16,6 +19,8 @@ from .transport import Transport
 class FlashSection:
     """A flash section with its offset and remote file name."""
 
+    __slots__ = ("offset", "file")
+
     def __init__(self, offset: int, file: str):
         self.offset = offset
         self.file = file
@@ -24,6 +29,8 @@ class FlashSection:
 class IdfFirmwareUploadResult:
     """Result of uploading ESP-IDF firmware sections."""
 
+    __slots__ = ("firmware", "flash_size")
+
     def __init__(self, firmware: list[FlashSection], flash_size: Optional[int] = None):
         self.firmware = firmware
         self.flash_size = flash_size
@@ -33,7 +40,8 @@ async def upload_file(
     transport: Transport, filename: str, local_path: Optional[Path] = None
 ) -> str:
     firmware_path = local_path or filename
-    content = Path(firmware_path).read_bytes()
+    # Read from a worker thread, so a slow disk doesn't stall the event loop
+    content = await asyncio.to_thread(Path(firmware_path).read_bytes)
     await upload(transport, filename, content)
     return filename
 
@@ -41,19 +49,67 @@ async def upload_file(
 async def upload_idf_firmware(
     transport: Transport, flasher_args_path: "str | Path"
 ) -> IdfFirmwareUploadResult:
-    result = resolveIdfFirmware(str(flasher_args_path))
-    sections: list[FlashSection] = []
-    for part in result["parts"]:
-        remote_name = f"flash-{part['offset']:x}.bin"
-        await upload(transport, remote_name, part["data"])
-        sections.append(FlashSection(offset=part["offset"], file=remote_name))
+    # Parsing flasher_args.json reads every section into memory; keep that disk I/O
+    # off the event loop, like upload_file() does
+    result = await asyncio.to_thread(resolveIdfFirmware, str(flasher_args_path))
+    sections = [
+        FlashSection(offset=part["offset"], file=f"flash-{part['offset']:x}.bin")
+        for part in result["parts"]
+    ]
+    await upload_many(
+        transport,
+        {section.file: part["data"] for section, part in zip(sections, result["parts"])},
+    )
     return IdfFirmwareUploadResult(firmware=sections, flash_size=result["flash_size"])
 
 
-async def upload(transport: Transport, name: str, content: bytes) -> ResponseMessage:
-    params = UploadParams(name=name, binary=base64.b64encode(content).decode())
-    return await transport.request("file:upload", params.model_dump())
+async def upload(
+    transport: Transport, name: str, content: Union[bytes, bytearray, memoryview]
+) -> ResponseMessage:
+    # A plain dict: validating and dumping a pydantic model would only copy the,
+    # possibly multi-MB, base64 string around
+    params = {"name": name, "binary": base64.b64encode(content).decode()}
+    return await transport.request("file:upload", params)
+
+
+async def upload_many(
+    transport: Transport, files: Mapping[str, Union[bytes, bytearray, memoryview, Path]]
+) -> None:
+    # The protocol has no batch upload, so pipeline the requests instead: all of them are
+    # sent before waiting for the first response, which costs one round-trip in total.
+    await asyncio.gather(
+        *(
+            upload_file(transport, name, content)
+            if isinstance(content, Path)
+            else upload(transport, name, content)
+            for name, content in files.items()
+        )
+    )
 
 
 async def download(transport: Transport, name: str) -> ResponseMessage:
     return await transport.request("file:download", {"name": name})
+
+
+# About 1 MiB of decoded data per write (a whole number of 4-character base64 groups)
+_DECODE_CHUNK = 1024 * 1024 // 3 * 4
+# Anything a2b_base64() skips over (line breaks, other whitespace), which would shift the
+# 4-character groups across chunk boundaries
+_NON_BASE64 = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+def write_base64_file(path: Path, binary: str) -> None:
+    """Decode base64 `binary` into the file at `path`, a chunk at a time.
+
+    Unlike decoding the whole payload first, peak memory grows by one chunk, not by the
+    size of the file. Blocking: run it in a worker thread from async code.
+    """
+    if _NON_BASE64.search(binary):
+        # Not plain base64 (e.g. wrapped in lines): decode in one go, like `download()`
+        data = binascii.a2b_base64(binary)
+        with open(path, "wb") as f:
+            f.write(data)
+        return
+    with open(path, "wb") as f:
+        for start in range(0, len(binary), _DECODE_CHUNK):
+            f.write(binascii.a2b_base64(binary[start : start + _DECODE_CHUNK]))
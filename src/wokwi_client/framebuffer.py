@@ -16,7 +16,8 @@ Exposed helpers:
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import binascii
 from pathlib import Path
 
 from .exceptions import WokwiError
@@ -27,6 +28,7 @@ __all__ = [
     "read_framebuffer",
     "read_framebuffer_png_bytes",
     "save_framebuffer_png",
+    "compare_framebuffer_png",
 ]
 
 
@@ -46,7 +48,8 @@ def _extract_png_b64(resp: ResponseMessage) -> str:
 async def read_framebuffer_png_bytes(transport: Transport, *, id: str) -> bytes:
     """Return decoded PNG bytes for the framebuffer of device `id`."""
     resp = await read_framebuffer(transport, id=id)
-    return base64.b64decode(_extract_png_b64(resp))
+    # Decode the str directly: b64decode() would first copy it into an ASCII bytes object
+    return binascii.a2b_base64(_extract_png_b64(resp))
 
 
 async def save_framebuffer_png(
@@ -64,7 +67,27 @@ async def save_framebuffer_png(
     if path.exists() and not overwrite:
         raise WokwiError(f"File already exists and overwrite=False: {path}")
     data = await read_framebuffer_png_bytes(transport, id=id)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "wb") as f:
-        f.write(data)
+    # Write from a worker thread, so a slow disk doesn't stall the event loop
+    await asyncio.to_thread(_write_png, path, data)
     return path
+
+
+def _write_png(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+async def compare_framebuffer_png(transport: Transport, *, id: str, reference: Path) -> bool:
+    """Return True if the framebuffer of device `id` matches the PNG file `reference`.
+
+    The comparison is byte for byte. The reference is read from a worker thread, and only
+    when its size matches: files of a different size are decided from the stat() alone.
+    """
+    current = await read_framebuffer_png_bytes(transport, id=id)
+    return await asyncio.to_thread(_file_equals, reference, current)
+
+
+def _file_equals(path: Path, data: bytes) -> bool:
+    if path.stat().st_size != len(data):
+        return False
+    return path.read_bytes() == data
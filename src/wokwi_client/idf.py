@@ -1,11 +1,53 @@
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import Optional, TypedDict
 
 logger = logging.getLogger(__name__)
 
 
+class _FirmwareCache:
+    """Contents of recently read firmware files, keyed by (path, mtime, size), so flashing
+    the same build again (e.g. once per test) doesn't re-read it."""
+
+    __slots__ = ("entries", "size", "max_size", "lock")
+
+    def __init__(self, max_size: int) -> None:
+        # Least recently used first
+        self.entries: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
+        # Total size of the entries, kept up to date so inserts needn't add it all up
+        self.size = 0
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple[str, int, int]) -> Optional[bytes]:
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+    def put(self, key: tuple[str, int, int], data: bytes) -> None:
+        with self.lock:
+            if key in self.entries:
+                return  # another thread read it meanwhile
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_size and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+_FIRMWARE_CACHE = _FirmwareCache(64 * 1024 * 1024)
+
+
 class FirmwarePart(TypedDict):
     offset: int
     data: bytes
@@ -52,8 +94,7 @@ def resolveIdfFirmware(flasher_args_path: str) -> IdfFirmwareResult:
         full_file_path = os.path.join(flasher_dir, file_path)
 
         try:
-            with open(full_file_path, "rb") as f:
-                data = f.read()
+            data = _read_firmware_file(full_file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Firmware file not found: {full_file_path}")
 
@@ -69,3 +110,27 @@ def resolveIdfFirmware(flasher_args_path: str) -> IdfFirmwareResult:
             logger.warning("Unexpected flash_size format in flasher_args.json: %r", raw)
 
     return {"parts": firmware_parts, "flash_size": flash_size}
+
+
+def clear_firmware_cache() -> None:
+    """
+    Drop the cached contents of firmware files read by `resolveIdfFirmware()`.
+
+    Up to 64 MiB of recently flashed firmware is kept in memory for the lifetime of the
+    process; call this to release it, e.g. between unrelated test sessions.
+    """
+    _FIRMWARE_CACHE.clear()
+
+
+def _read_firmware_file(path: str) -> bytes:
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    data = _FIRMWARE_CACHE.get(key)
+    if data is not None:
+        return data
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) != st.st_size:
+        return data  # changed while we read it, don't cache under the old stat
+    _FIRMWARE_CACHE.put(key, data)
+    return data
@@ -5,11 +5,6 @@
 from pydantic import BaseModel, Field
 
 
-class UploadParams(BaseModel):
-    name: str
-    binary: str  # base64
-
-
 class SimulationParams(BaseModel):
     firmware: str
     elf: str
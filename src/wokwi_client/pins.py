@@ -11,6 +11,8 @@ This module exposes helper coroutines for issuing pin-related commands:
 #
 # SPDX-License-Identifier: MIT
 
+import functools
+from collections.abc import Sequence
 from typing import TypedDict
 
 from wokwi_client.protocol_types import ResponseMessage
@@ -44,7 +46,7 @@ async def pin_read(transport: Transport, *, part: str, pin: str) -> ResponseMess
         pin: Pin name (e.g. "A2", "13").
     """
 
-    return await transport.request("pin:read", {"part": part, "pin": pin})
+    return await transport.request_template(_pin_read_template(part, pin))
 
 
 async def pin_listen(transport: Transport, *, part: str, pin: str, listen: bool = True) -> None:
@@ -63,6 +65,37 @@ async def pin_listen(transport: Transport, *, part: str, pin: str, listen: bool
     await transport.request("pin:listen", {"part": part, "pin": pin, "listen": listen})
 
 
+async def pin_read_many(
+    transport: Transport, pins: Sequence[tuple[str, str]]
+) -> list[ResponseMessage]:
+    """Read the state of several pins, sending all requests before awaiting any response.
+
+    Args:
+        transport: The active Transport instance.
+        pins: (part, pin) pairs.
+    """
+
+    return await transport.request_template_many(
+        [_pin_read_template(part, pin) for part, pin in pins]
+    )
+
+
+async def pin_listen_many(
+    transport: Transport, pins: Sequence[tuple[str, str]], listen: bool = True
+) -> None:
+    """Enable or disable listening for changes on several pins, in a single round-trip.
+
+    Args:
+        transport: The active Transport instance.
+        pins: (part, pin) pairs.
+        listen: True to start listening, False to stop.
+    """
+
+    await transport.request_many(
+        [("pin:listen", {"part": part, "pin": pin, "listen": listen}) for part, pin in pins]
+    )
+
+
 async def gpio_list(transport: Transport) -> ResponseMessage:
     """List all GPIO pins and their current states.
 
@@ -71,3 +104,10 @@ async def gpio_list(transport: Transport) -> ResponseMessage:
     """
 
     return await transport.request("gpio:list", {})
+
+
+@functools.lru_cache(maxsize=256)
+def _pin_read_template(part: str, pin: str) -> str:
+    # Test scripts tend to poll the same few pins, so encode each pin:read frame once
+    # (see control._control_template)
+    return Transport.command_template("pin:read", {"part": part, "pin": pin})
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sys
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+_uvloop: Any = None
+try:  # optional, installed with the "fast" extra
+    import uvloop
+
+    _uvloop = uvloop
+except ImportError:  # pragma: no cover
+    pass
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion, like `asyncio.run()`, on the fastest available event loop.
+
+    When uvloop is installed (`pip install wokwi-client[fast]`), it is used instead of the
+    default asyncio event loop, which lowers the per-message overhead of the websocket
+    connection. uvloop doesn't support Windows, so there we always use `asyncio.run()`.
+
+    Args:
+        main: The coroutine to run, typically `main()`.
+
+    Returns:
+        The value returned by the coroutine.
+    """
+    if _uvloop is not None and sys.platform != "win32":
+        result: T = _uvloop.run(main)
+        return result
+    return asyncio.run(main)
+
+
+def new_event_loop(use_uvloop: bool = True) -> asyncio.AbstractEventLoop:
+    """Create a new event loop, using uvloop if requested and available (see `run()`)."""
+    if use_uvloop and _uvloop is not None and sys.platform != "win32":
+        loop: asyncio.AbstractEventLoop = _uvloop.new_event_loop()
+        return loop
+    return asyncio.new_event_loop()
+
+
+def install_uvloop() -> bool:
+    """Make uvloop the default event loop for code that doesn't use `run()`.
+
+    Sets uvloop's event loop policy, so loops created afterwards (e.g. by `asyncio.run()`
+    or a test framework) are uvloop loops. Call it once, before starting any loop.
+
+    Returns:
+        True if uvloop was installed, False if it isn't available (not installed, or on
+        Windows), in which case the default asyncio loop stays in place.
+    """
+    if _uvloop is None or sys.platform == "win32":
+        return False
+    asyncio.set_event_loop_policy(_uvloop.EventLoopPolicy())
+    return True
@@ -2,24 +2,50 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import codecs
+import sys
 from collections.abc import AsyncGenerator
-from typing import Union
+from typing import Optional, Union
 
 from .event_queue import EventQueue
 from .transport import Transport
 
+_LISTEN_TEMPLATE = Transport.command_template("serial-monitor:listen", {})
+
 
 async def monitor_lines(transport: Transport) -> AsyncGenerator[bytes, None]:
     """
     Monitor the serial output lines.
     """
-    await transport.request("serial-monitor:listen", {})
+    # Listen for events before subscribing, so data sent right after the response isn't lost
     with EventQueue(transport, "serial-monitor:data") as queue:
+        await transport.subscribe(_LISTEN_TEMPLATE)
         while True:
             event_msg = await queue.get()
             yield bytes(event_msg["payload"]["bytes"])
 
 
+async def monitor_payloads(transport: Transport) -> AsyncGenerator[list[int], None]:
+    """
+    Monitor the serial output, yielding each chunk as the list of byte values it arrives as.
+
+    For consumers that copy the data anyway (like `StdoutWriter`), this skips the
+    intermediate `bytes` object `monitor_lines` creates for every line.
+    """
+    # Listen for events before subscribing, so data sent right after the response isn't lost
+    with EventQueue(transport, "serial-monitor:data") as queue:
+        await transport.subscribe(_LISTEN_TEMPLATE)
+        while True:
+            event_msg = await queue.get()
+            yield event_msg["payload"]["bytes"]
+
+
+async def write_serial_bytes(transport: Transport, data: bytes) -> None:
+    """Write raw bytes to the serial monitor, skipping the type dispatch of `write_serial`."""
+    await transport.request("serial-monitor:write", {"bytes": list(data)})
+
+
 async def write_serial(transport: Transport, data: Union[bytes, str, list[int]]) -> None:
     """Write data to the serial monitor.
 
@@ -27,8 +53,106 @@ async def write_serial(transport: Transport, data: Union[bytes, str, list[int]])
     """
     if isinstance(data, str):
         payload = list(data.encode("utf-8"))
-    elif isinstance(data, bytes):
+    elif isinstance(data, (bytes, bytearray, memoryview)):
         payload = list(data)
     else:
-        payload = list(int(b) & 0xFF for b in data)
+        values = list(data)  # an iterable can only be walked once
+        try:
+            # Converted in C when every value already is a byte (the usual case)
+            payload = list(bytes(values))
+        except (ValueError, TypeError):
+            payload = [int(b) & 0xFF for b in values]
     await transport.request("serial-monitor:write", {"bytes": payload})
+
+
+class StdoutWriter:
+    """Write serial output to stdout in batches.
+
+    Lines are collected in a buffer that is written to `sys.stdout.buffer` in one go once
+    it holds `flush_size` bytes, or `flush_interval` seconds after the first pending line,
+    instead of paying for a write + flush on every line. Must be created on the event loop
+    that delivers the lines.
+
+    With `decode_utf8=None`, lines are decoded only when stdout is a terminal; when it is
+    redirected to a file or pipe, the raw bytes are passed through without decoding.
+    """
+
+    def __init__(
+        self,
+        decode_utf8: Optional[bool] = None,
+        errors: str = "replace",
+        flush_size: int = 4096,
+        flush_interval: float = 0.01,
+    ) -> None:
+        self._loop = asyncio.get_running_loop()
+        if decode_utf8 is None:
+            decode_utf8 = sys.stdout.isatty()
+        self._decode_utf8 = decode_utf8
+        self._errors = errors
+        self._encoding = sys.stdout.encoding or "utf-8"
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        # Incremental, so a multi-byte character split across two lines still decodes
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors)
+        self._pending = False
+        self._buf = bytearray()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def write(self, line: Union[bytes, list[int]]) -> None:
+        if self._decode_utf8:
+            data = line if isinstance(line, bytes) else bytes(line)
+            if not self._pending and data.isascii():
+                # Plain ASCII reads the same in any stdout encoding, no decode/encode needed
+                self._buf += data
+            else:
+                self._buf += self._decode(data).encode(self._encoding, errors="replace")
+        else:
+            # Copies a list of byte values straight in, without a bytes object in between
+            self._buf.extend(line)
+        if len(self._buf) >= self._flush_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._flush_interval, self.flush)
+
+    def _decode(self, data: bytes) -> str:
+        if self._errors == "strict":
+            try:
+                text = self._decoder.decode(data)
+            except UnicodeDecodeError:
+                # Fallback to raw bytes if decoding fails completely
+                self._decoder.reset()
+                text = str(data)
+        else:
+            # Other error handlers never raise, so no try/except on the common path
+            text = self._decoder.decode(data)
+        # An incomplete character at the end waits in the decoder for the next line
+        self._pending = bool(self._decoder.getstate()[0])
+        return text
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buf:
+            return
+        stdout = sys.stdout
+        binary = getattr(stdout, "buffer", None)
+        if binary is None:
+            # stdout was replaced by a text-only stream (e.g. io.StringIO)
+            stdout.write(self._buf.decode(self._encoding, errors="replace"))
+        else:
+            # Push out any pending text first, so output stays in order
+            stdout.flush()
+            binary.write(self._buf)
+            binary.flush()
+        self._buf.clear()
+
+    def close(self) -> None:
+        """Write out everything still pending, including an incomplete trailing character."""
+        if self._decode_utf8:
+            try:
+                text = self._decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                text = ""
+            self._buf += text.encode(self._encoding, errors="replace")
+        self.flush()
@@ -2,11 +2,19 @@
 #
 # SPDX-License-Identifier: MIT
 
+from collections.abc import Sequence
 from typing import Any, Optional
 
 from .protocol_types import ResponseMessage
 from .transport import Transport
 
+# Shared immutable default, serialized as an empty JSON array
+_NO_CHIPS: tuple[str, ...] = ()
+
+# Constant commands, encoded once
+_PAUSE_TEMPLATE = Transport.command_template("sim:pause", {})
+_RESUME_TEMPLATE = Transport.command_template("sim:resume", {"pauseAfter": None})
+
 
 async def start(  # noqa: PLR0913
     transport: Transport,
@@ -15,9 +23,9 @@ async def start(  # noqa: PLR0913
     flash_size: Optional[int] = None,
     elf: Optional[str] = None,
     pause: bool = False,
-    chips: list[str] = [],
+    chips: Optional[Sequence[str]] = None,
 ) -> ResponseMessage:
-    params: dict[str, Any] = {"elf": elf, "pause": pause, "chips": chips}
+    params: dict[str, Any] = {"elf": elf, "pause": pause, "chips": chips or _NO_CHIPS}
     if isinstance(firmware, list):
         params["firmware"] = [{"offset": s.offset, "file": s.file} for s in firmware]
     elif firmware is not None:
@@ -28,10 +36,12 @@ async def start(  # noqa: PLR0913
 
 
 async def pause(transport: Transport) -> ResponseMessage:
-    return await transport.request("sim:pause", {})
+    return await transport.request_template(_PAUSE_TEMPLATE)
 
 
 async def resume(transport: Transport, pause_after: Optional[int] = None) -> ResponseMessage:
+    if pause_after is None:
+        return await transport.request_template(_RESUME_TEMPLATE)
     return await transport.request("sim:resume", {"pauseAfter": pause_after})
 
 
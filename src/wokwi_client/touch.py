@@ -12,6 +12,8 @@ Assumptions:
 #
 # SPDX-License-Identifier: MIT
 
+import functools
+import math
 from typing import Any, Optional
 
 from .protocol_types import ResponseMessage
@@ -38,7 +40,33 @@ async def touch_event(  # noqa: PLR0913
         release_after: For "press" events, automatically release after
             this many nanoseconds (optional).
     """
-    params: dict[str, Any] = {"part": part, "x": x, "y": y, "event": event}
+    if _is_plain_number(x) and _is_plain_number(y):
+        # Touch gestures are streams of events that only differ in their coordinates:
+        # splice those into the frame encoded for the part / event type
+        head, middle, tail = _touch_frame_parts(part, event, release_after)
+        return await transport.request_template(head + repr(x) + middle + repr(y) + tail)
+    params: dict[str, Any] = {"part": part, "event": event}
     if release_after is not None:
         params["releaseAfter"] = release_after
+    params["x"] = x
+    params["y"] = y
     return await transport.request("touch:event", params)
+
+
+def _is_plain_number(value: float) -> bool:
+    # Numbers whose repr() is also their JSON encoding (not bool, nan or inf)
+    return type(value) is int or (type(value) is float and math.isfinite(value))
+
+
+@functools.lru_cache(maxsize=256)
+def _touch_frame_parts(part: str, event: str, release_after: Optional[int]) -> tuple[str, str, str]:
+    params: dict[str, Any] = {"part": part, "event": event}
+    if release_after is not None:
+        params["releaseAfter"] = release_after
+    # x and y go last, so they are the last two placeholders in the encoded frame
+    params["x"] = 0.0
+    params["y"] = 0.0
+    template = Transport.command_template("touch:event", params)
+    rest, _, tail = template.rpartition("0.0")
+    head, _, middle = rest.rpartition("0.0")
+    return head, middle, tail
@@ -4,9 +4,11 @@
 
 import asyncio
 import contextlib
+import inspect
 import json
 import os
 import warnings
+from collections.abc import Sequence
 from typing import Any, Callable, Optional, cast
 
 import websockets
@@ -24,25 +26,99 @@ from .protocol_types import EventMessage, HelloMessage, IncomingMessage, Respons
 
 TRANSPORT_DEFAULT_WS_URL = os.getenv("WOKWI_CLI_SERVER", DEFAULT_WS_URL)
 
+# Use orjson when available (the "fast" extra), it encodes and parses messages several times
+# faster than json. Messages are sent as str either way, so they still go out as text frames.
+try:
+    import orjson
+
+    def _dumps(message: dict[str, Any]) -> str:
+        encoded: bytes = orjson.dumps(message)
+        return encoded.decode()
+
+    def _loads(raw_message: str) -> Any:
+        return orjson.loads(raw_message)
+
+except ImportError:  # pragma: no cover
+
+    def _dumps(message: dict[str, Any]) -> str:
+        return json.dumps(message)
+
+    def _loads(raw_message: str) -> Any:
+        return json.loads(raw_message)
+
+
+# websockets.connect() options. Responses carrying files, framebuffers or VCD captures easily
+# exceed the default 1 MiB message limit, and larger buffers absorb bursts of serial data or
+# pipelined commands without waiting for a drain. permessage-deflate is off: the messages
+# are small JSON, so inflating every incoming frame costs more CPU than it saves bandwidth.
+_WS_CONNECT_OPTIONS: dict[str, Any] = {
+    "max_size": None,
+    "read_limit": 2**20,
+    "write_limit": 2**20,
+    "compression": None,
+}
+
 
 class Transport:
-    def __init__(self, token: str, url: str = TRANSPORT_DEFAULT_WS_URL):
+    __slots__ = (
+        "_token",
+        "_url",
+        "_ws_kwargs",
+        "_next_id",
+        "_ws",
+        "_event_listeners",
+        "_response_futures",
+        "_recv_task",
+        "_closed",
+        "_max_inflight",
+        "_inflight",
+        "_subscriptions",
+    )
+
+    def __init__(
+        self,
+        token: str,
+        url: str = TRANSPORT_DEFAULT_WS_URL,
+        ws_kwargs: Optional[dict[str, Any]] = None,
+        max_inflight: int = 1024,
+    ):
+        """
+        Args:
+            token: API token.
+            url: Websocket URL of the Wokwi server.
+            ws_kwargs: Extra keyword arguments for `websockets.connect()`, overriding
+                the defaults (no message size limit, 1 MiB read and write buffers, no
+                compression; pass `{"compression": "deflate"}` for slow links).
+            max_inflight: Maximum number of requests awaiting a response. Further requests
+                wait until a response frees a slot, rather than piling up without bound.
+        """
         self._token = token
         self._url = url
+        self._ws_kwargs = {**_WS_CONNECT_OPTIONS, **(ws_kwargs or {})}
         self._next_id = 1
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
-        self._event_listeners: dict[str, list[Callable[[EventMessage], Any]]] = {}
+        # Listeners in registration order, each with whether it is a coroutine function:
+        # that is checked once when registered, so dispatch needn't probe each result
+        self._event_listeners: dict[str, list[tuple[Callable[[EventMessage], Any], bool]]] = {}
         self._response_futures: dict[str, asyncio.Future[ResponseMessage]] = {}
         self._recv_task: Optional[asyncio.Task[None]] = None
         self._closed = False
+        self._max_inflight = max_inflight
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._subscriptions: set[str] = set()
 
     async def connect(self, throw_error: bool = True) -> dict[str, Any]:
+        # Created here rather than in __init__, so it binds to the loop we connect on
+        self._inflight = asyncio.Semaphore(self._max_inflight)
+        # Subscriptions belong to the server-side session, a new connection starts without any
+        self._subscriptions.clear()
         self._ws = await websockets.connect(
             self._url,
             extra_headers={
                 "Authorization": f"Bearer {self._token}",
                 "User-Agent": f"wokwi-client-py/{get_version()}",
             },
+            **self._ws_kwargs,
         )
         hello: IncomingMessage = await self._recv()
         if hello["type"] != MSG_TYPE_HELLO or hello.get("protocolVersion") != PROTOCOL_VERSION:
@@ -65,94 +141,183 @@ class Transport:
     def add_event_listener(self, event_type: str, listener: Callable[[EventMessage], Any]) -> None:
         if event_type not in self._event_listeners:
             self._event_listeners[event_type] = []
-        self._event_listeners[event_type].append(listener)
+        # inspect.iscoroutinefunction() also looks through functools.partial
+        self._event_listeners[event_type].append((listener, inspect.iscoroutinefunction(listener)))
 
     def remove_event_listener(
         self, event_type: str, listener: Callable[[EventMessage], Any]
     ) -> None:
         if event_type in self._event_listeners:
+            # Replace rather than mutate the list: _dispatch_event may be iterating over it,
+            # and listeners often remove themselves (or each other) from a callback
             self._event_listeners[event_type] = [
-                registered_listener
-                for registered_listener in self._event_listeners[event_type]
-                if registered_listener != listener
+                entry for entry in self._event_listeners[event_type] if entry[0] != listener
             ]
             if not self._event_listeners[event_type]:
                 del self._event_listeners[event_type]
 
     async def _dispatch_event(self, event_msg: EventMessage) -> None:
-        listeners = self._event_listeners.get(event_msg["event"], [])
-        for listener in listeners:
+        for listener, is_async in self._event_listeners.get(event_msg["event"], ()):
             result = listener(event_msg)
-            if hasattr(result, "__await__"):
+            # Plain functions may still return an awaitable (e.g. a lambda wrapping a
+            # coroutine call)
+            if is_async or (result is not None and inspect.isawaitable(result)):
                 await result
 
     async def request(self, command: str, params: dict[str, Any]) -> ResponseMessage:
+        msg_id, future = await self._new_request()
+        frame = _dumps({"type": "command", "command": command, "params": params, "id": msg_id})
+        return await self._send_request(msg_id, future, frame)
+
+    @staticmethod
+    def command_template(command: str, params: dict[str, Any]) -> str:
+        """Encode a command once, so it can be sent repeatedly with `request_template()`.
+
+        The template is the JSON frame minus the request id, which differs per request.
+        """
+        frame = _dumps({"type": "command", "command": command, "params": params})
+        return frame[:-1] + ',"id":"'
+
+    async def request_template(self, template: str) -> ResponseMessage:
+        """Like `request()`, for a command pre-encoded with `command_template()`.
+
+        Skips JSON encoding: only the request id is filled in.
+        """
+        msg_id, future = await self._new_request()
+        return await self._send_request(msg_id, future, template + msg_id + '"}')
+
+    async def subscribe(self, template: str) -> None:
+        """Send a subscription command (encoded with `command_template()`) once per connection.
+
+        Subscriptions stay active for the rest of the session, so later calls return at once
+        instead of repeating the round-trip.
+        """
+        if template in self._subscriptions:
+            return
+        self._subscriptions.add(template)
+        try:
+            await self.request_template(template)
+        except BaseException:
+            self._subscriptions.discard(template)
+            raise
+
+    async def request_many(
+        self, commands: Sequence[tuple[str, dict[str, Any]]]
+    ) -> list[ResponseMessage]:
+        """Send several commands back to back, then wait for all of their responses.
+
+        Costs a single round-trip, like gathering `request()` calls, but without a task per
+        command. Responses are returned in order; an error response raises `ServerError`.
+        """
+        return await self.request_template_many(
+            [self.command_template(command, params) for command, params in commands]
+        )
+
+    async def request_template_many(self, templates: Sequence[str]) -> list[ResponseMessage]:
+        """Like `request_many()`, for commands pre-encoded with `command_template()`."""
+        requests: list[tuple[str, asyncio.Future[ResponseMessage]]] = []
+        try:
+            # Every frame goes out before the first response is awaited (unless the in-flight
+            # limit is reached, then sending waits for earlier responses)
+            for template in templates:
+                msg_id, future = await self._new_request()
+                requests.append((msg_id, future))
+                await cast(websockets.WebSocketClientProtocol, self._ws).send(
+                    template + msg_id + '"}'
+                )
+            return [await future for _, future in requests]
+        finally:
+            for msg_id, future in requests:
+                self._forget_request(msg_id, future)
+
+    async def _new_request(self) -> tuple[str, asyncio.Future[ResponseMessage]]:
         if self._ws is None:
             raise WokwiError("Not connected")
+        inflight = cast(asyncio.Semaphore, self._inflight)
+        await inflight.acquire()
         msg_id = str(self._next_id)
         self._next_id += 1
 
         loop = asyncio.get_running_loop()
         future: asyncio.Future[ResponseMessage] = loop.create_future()
+        # The slot is freed once the future settles: answered, failed or cancelled
+        future.add_done_callback(lambda _: inflight.release())
         self._response_futures[msg_id] = future
+        return msg_id, future
 
-        await self._ws.send(
-            json.dumps({"type": "command", "command": command, "params": params, "id": msg_id})
-        )
+    def _forget_request(self, msg_id: str, future: asyncio.Future[ResponseMessage]) -> None:
+        self._response_futures.pop(msg_id, None)
+        # A request that failed before its response arrived must still free its slot
+        if not future.done():
+            future.cancel()
+
+    async def _send_request(
+        self, msg_id: str, future: asyncio.Future[ResponseMessage], frame: str
+    ) -> ResponseMessage:
         try:
-            resp_msg_resp = await future
-            if resp_msg_resp.get("error"):
-                result = resp_msg_resp.get("result", {})
-                raise ServerError(result.get("message", "Unknown server error"))
-            return resp_msg_resp
+            await cast(websockets.WebSocketClientProtocol, self._ws).send(frame)
+            return await future
         finally:
             # Remove future mapping if still present (be defensive)
-            self._response_futures.pop(msg_id, None)
+            self._forget_request(msg_id, future)
 
-    async def _background_recv(self, throw_error: bool = True) -> None:  # noqa: PLR0912
+    async def _background_recv(self, throw_error: bool = True) -> None:
+        ws = cast(websockets.WebSocketClientProtocol, self._ws)
         try:
-            while not self._closed and self._ws is not None:
-                msg: IncomingMessage = await self._recv()
+            async for raw_message in ws:
+                if isinstance(raw_message, bytes):
+                    warnings.warn("Unexpected binary message received and skipped", RuntimeWarning)
+                    continue
+                msg = _parse_message(raw_message)
                 if msg["type"] == MSG_TYPE_EVENT:
                     await self._dispatch_event(cast(EventMessage, msg))
                 elif msg["type"] == MSG_TYPE_RESPONSE:
-                    resp_msg_resp = cast(ResponseMessage, msg)
-                    resp_id = str(resp_msg_resp.get("id"))
-                    future = self._response_futures.get(resp_id)
-                    if future is None or future.done():
-                        continue
-                    future.set_result(resp_msg_resp)
+                    self._resolve_response(cast(ResponseMessage, msg))
+            # The iteration ends when the server closes the connection normally: report it
+            # the same way recv() does
+            raise websockets.ConnectionClosedOK(
+                ws.close_rcvd, ws.close_sent, ws.close_rcvd_then_sent
+            )
         except asyncio.CancelledError:
             # Expected during shutdown via close()
             raise
         except websockets.ConnectionClosed as e:
-            # Mark closed and fail pending futures to avoid hangs.
-            self._closed = True
-            for fut in list(self._response_futures.values()):
-                if not fut.done():
-                    fut.set_exception(e)
-            with contextlib.suppress(Exception):
-                if self._ws:
-                    await self._ws.close()
+            await self._fail_pending(e)
             if throw_error:
                 raise
         except Exception as e:
             warnings.warn(f"Background recv error: {e}", RuntimeWarning)
             if throw_error:
-                self._closed = True
-                for fut in list(self._response_futures.values()):
-                    if not fut.done():
-                        fut.set_exception(e)
-                with contextlib.suppress(Exception):
-                    if self._ws:
-                        await self._ws.close()
+                await self._fail_pending(e)
                 raise
         finally:
             # If we’re exiting the loop and marked closed, ensure no future hangs.
             if self._closed:
-                for fut in list(self._response_futures.values()):
-                    if not fut.done():
-                        fut.set_exception(RuntimeError("Transport receive loop exited"))
+                self._fail_futures(RuntimeError("Transport receive loop exited"))
+
+    def _resolve_response(self, response: ResponseMessage) -> None:
+        future = self._response_futures.get(str(response.get("id")))
+        if future is None or future.done():
+            return
+        # Error responses fail only the request they answer
+        if response.get("error"):
+            result = response.get("result", {})
+            future.set_exception(ServerError(result.get("message", "Unknown server error")))
+        else:
+            future.set_result(response)
+
+    async def _fail_pending(self, exc: BaseException) -> None:
+        """Mark the transport closed and fail pending requests with `exc`, so none hangs."""
+        self._closed = True
+        self._fail_futures(exc)
+        with contextlib.suppress(Exception):
+            if self._ws:
+                await self._ws.close()
+
+    def _fail_futures(self, exc: BaseException) -> None:
+        for fut in list(self._response_futures.values()):
+            if not fut.done():
+                fut.set_exception(exc)
 
     async def _recv(self) -> IncomingMessage:
         if self._ws is None:
@@ -161,15 +326,16 @@ class Transport:
         while isinstance(raw_message, bytes):
             warnings.warn("Unexpected binary message received and skipped", RuntimeWarning)
             raw_message = await self._ws.recv()
-        try:
-            message = json.loads(raw_message)
-        except json.JSONDecodeError as e:
-            raise WokwiError(f"Failed to parse message: {raw_message}") from e
-        if "type" not in message:
-            raise WokwiError(f"Invalid message: {message}")
-        if message["type"] == "error":
-            raise WokwiError(f"Server error: {message['message']}")
-        if message["type"] == "response" and message.get("error"):
-            result = message.get("result", {"code": -1, "message": "Unknown error"})
-            raise WokwiError(f"Server error {result['code']}: {result['message']}")
-        return cast(IncomingMessage, message)
+        return _parse_message(raw_message)
+
+
+def _parse_message(raw_message: str) -> IncomingMessage:
+    try:
+        message = _loads(raw_message)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
+        raise WokwiError(f"Failed to parse message: {raw_message}") from e
+    if "type" not in message:
+        raise WokwiError(f"Invalid message: {message}")
+    if message["type"] == "error":
+        raise WokwiError(f"Server error: {message['message']}")
+    return cast(IncomingMessage, message)
@@ -14,6 +14,7 @@ Exposed helpers:
 
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from typing import TypedDict
 
@@ -95,7 +96,12 @@ async def save_vcd(transport: Transport, *, path: Path, overwrite: bool = True)
         raise WokwiError(f"File already exists and overwrite=False: {path}")
     data = await read_vcd(transport)
     if data["sample_count"] > 0:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            f.write(data["vcd"])
+        # Write from a worker thread, so a slow disk doesn't stall the event loop
+        await asyncio.to_thread(_write_vcd, path, data["vcd"])
     return data
+
+
+def _write_vcd(path: Path, vcd: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(vcd)
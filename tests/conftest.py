@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import compileall
+import importlib
+from pathlib import Path
+
+import pytest
+
+from .utils import _TOKEN_OK
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _prewarm() -> None:
+    """Import wokwi_client and byte-compile the examples once, up front.
+
+    Otherwise the first example test of each worker pays for it, which skews its timing.
+    The compiled examples also let `WOKWI_TESTS_SUBPROCESS=1` runs start from the .pyc files.
+    """
+    importlib.import_module("wokwi_client")
+    compileall.compile_dir(EXAMPLES_DIR, quiet=1)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip tests that talk to the Wokwi simulator when no API token is configured.
+
+    Decided once at collection time, so the skipped tests don't set up any fixtures.
+    """
+    if _TOKEN_OK:
+        return
+    skip = pytest.mark.skip(
+        reason="WOKWI_CLI_TOKEN environment variable is not set. "
+        "You can get it from https://wokwi.com/dashboard/ci."
+    )
+    for item in items:
+        if item.get_closest_marker("requires_token"):
+            item.add_marker(skip)
@@ -0,0 +1,107 @@
+"""
+Fake websocket server side for offline tests of the transport and clients.
+
+`FakeWebSocket` stands in for the connection returned by `websockets.connect()`: it sends
+the hello message, records every frame the client sends, and answers each command.
+Use `patch_connect()` to make every `Transport.connect()` use a new fake.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+import websockets
+
+HELLO = {"type": "hello", "protocolVersion": 1, "appName": "fake", "appVersion": "1.0"}
+
+
+class FakeWebSocket:
+    """A fake websocket connection that answers commands like the Wokwi server.
+
+    Commands named "fail" get an error response. Every other command is answered with its
+    params echoed back under `result`. With `hold=True`, responses are kept in `held`
+    until `release()` is called.
+    """
+
+    def __init__(self, hold: bool = False) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.hold = hold
+        self.held: list[dict[str, Any]] = []
+        self.send_error: Exception | None = None
+        self.close_rcvd = None
+        self.close_sent = None
+        self.close_rcvd_then_sent = None
+        self._incoming: asyncio.Queue[str | None] = asyncio.Queue()
+        self._incoming.put_nowait(json.dumps(HELLO))
+
+    async def send(self, frame: str) -> None:
+        if self.send_error is not None:
+            raise self.send_error
+        message = json.loads(frame)
+        self.sent.append(message)
+        response = self.respond(message)
+        if self.hold:
+            self.held.append(response)
+        else:
+            self.push(response)
+
+    def respond(self, message: dict[str, Any]) -> dict[str, Any]:
+        response: dict[str, Any] = {
+            "type": "response",
+            "command": message["command"],
+            "id": message["id"],
+        }
+        if message["command"] == "fail":
+            response["error"] = True
+            response["result"] = {"code": 1, "message": "boom"}
+        else:
+            response["result"] = {"echo": message["params"]}
+        return response
+
+    def release(self, reverse: bool = False) -> None:
+        """Send the held responses, in order or in reverse order."""
+        held = reversed(self.held) if reverse else self.held
+        for response in list(held):
+            self.push(response)
+        self.held.clear()
+
+    def push(self, message: dict[str, Any]) -> None:
+        """Send a message (a response or an event) to the client."""
+        self._incoming.put_nowait(json.dumps(message))
+
+    def commands(self) -> list[str]:
+        return [message["command"] for message in self.sent]
+
+    async def recv(self) -> str:
+        message = await self._incoming.get()
+        if message is None:
+            raise websockets.ConnectionClosedOK(None, None)
+        return message
+
+    def __aiter__(self) -> FakeWebSocket:
+        return self
+
+    async def __anext__(self) -> str:
+        message = await self._incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self) -> None:
+        self._incoming.put_nowait(None)
+
+
+def patch_connect(monkeypatch: pytest.MonkeyPatch, hold: bool = False) -> list[FakeWebSocket]:
+    """Make `websockets.connect()` return fakes; returns the list of fakes created so far."""
+    sockets: list[FakeWebSocket] = []
+
+    async def connect(*args: Any, **kwargs: Any) -> FakeWebSocket:
+        ws = FakeWebSocket(hold)
+        sockets.append(ws)
+        return ws
+
+    monkeypatch.setattr(websockets, "connect", connect)
+    return sockets
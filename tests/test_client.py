@@ -0,0 +1,185 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from wokwi_client import WokwiClient
+from wokwi_client.exceptions import WokwiError
+
+from .fakes import FakeWebSocket, patch_connect
+
+
+def _serial_writes(ws: FakeWebSocket) -> list[list[int]]:
+    return [
+        message["params"]["bytes"]
+        for message in ws.sent
+        if message["command"] == "serial-monitor:write"
+    ]
+
+
+def test_buffered_serial_writes_are_combined(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Writes within 5 ms of each other go out as a single serial-monitor:write."""
+    sockets = patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        client.serial_write_buffered(b"ab")
+        client.serial_write_buffered("c")
+        client.serial_write_buffered([100, 0x65])
+        assert _serial_writes(sockets[0]) == []
+        await asyncio.sleep(0.05)
+        client.serial_write_buffered(b"later")
+        await asyncio.sleep(0.05)
+        await client.disconnect()
+
+    asyncio.run(main())
+    assert _serial_writes(sockets[0]) == [list(b"abcde"), list(b"later")]
+
+
+def test_buffered_serial_write_rejects_out_of_range_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Values outside 0-255 raise ValueError, like serial_write() does."""
+    patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        with pytest.raises(ValueError):
+            client.serial_write_buffered([100, 0x165])
+        await client.disconnect()
+
+    asyncio.run(main())
+
+
+def test_flush_serial_raises_send_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """flush_serial() sends the buffer right away and reports errors to the caller."""
+    sockets = patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        client.serial_write_buffered(b"now")
+        await client.flush_serial()
+        assert _serial_writes(sockets[0]) == [list(b"now")]
+
+        sockets[0].send_error = ConnectionError("send failed")
+        client.serial_write_buffered(b"lost")
+        with pytest.raises(ConnectionError):
+            await client.flush_serial()
+        sockets[0].send_error = None
+        await client.disconnect()
+
+    asyncio.run(main())
+
+
+def test_disconnect_flushes_buffered_serial_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Data still waiting in the buffer is sent before the connection is closed."""
+    sockets = patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        client.serial_write_buffered(b"bye")
+        await client.disconnect()
+
+    asyncio.run(main())
+    assert _serial_writes(sockets[0]) == [list(b"bye")]
+
+
+def test_disconnect_waits_for_timer_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The connection isn't closed under a write started by the timer."""
+    sockets = patch_connect(monkeypatch, hold=True)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        client.serial_write_buffered(b"bye")
+        await asyncio.sleep(0.05)
+        disconnect = asyncio.create_task(client.disconnect())
+        await asyncio.sleep(0.01)
+        assert not disconnect.done()
+        sockets[0].release()
+        await disconnect
+
+    asyncio.run(main())
+    assert _serial_writes(sockets[0]) == [list(b"bye")]
+
+
+def test_disconnect_raises_flush_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """If the buffered data can't be sent, disconnect() still closes and then raises."""
+    sockets = patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        sockets[0].send_error = ConnectionError("send failed")
+        client.serial_write_buffered(b"bye")
+        with pytest.raises(ConnectionError):
+            await client.disconnect()
+        assert client._transport._closed
+
+    asyncio.run(main())
+
+
+def test_flush_serial_waits_for_timer_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    """flush_serial() returns only once a write started by the timer has completed."""
+    sockets = patch_connect(monkeypatch, hold=True)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        client.serial_write_buffered(b"abc")
+        await asyncio.sleep(0.05)
+        assert _serial_writes(sockets[0]) == [list(b"abc")]
+        flush = asyncio.create_task(client.flush_serial())
+        await asyncio.sleep(0.01)
+        assert not flush.done()
+        sockets[0].release()
+        await flush
+        await client.disconnect()
+
+    asyncio.run(main())
+
+
+def test_flush_serial_raises_timer_write_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed write started by the timer is reported by the next flush_serial()."""
+    sockets = patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        await client.connect()
+        sockets[0].send_error = ConnectionError("send failed")
+        client.serial_write_buffered(b"lost")
+        await asyncio.sleep(0.05)
+        with pytest.raises(ConnectionError):
+            await client.flush_serial()
+        sockets[0].send_error = None
+        client.serial_write_buffered(b"ok")
+        await client.flush_serial()
+        await client.disconnect()
+
+    asyncio.run(main())
+    assert _serial_writes(sockets[0]) == [list(b"ok")]
+
+
+def test_wait_until_simulation_time_requires_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Before connect() and after disconnect(), it raises WokwiError("Not connected")."""
+    patch_connect(monkeypatch)
+
+    async def main() -> None:
+        client = WokwiClient("token")
+        with pytest.raises(WokwiError, match="Not connected"):
+            await client.wait_until_simulation_time(1)
+        await client.connect()
+        await client.disconnect()
+        with pytest.raises(WokwiError, match="Not connected"):
+            await client.wait_until_simulation_time(1)
+
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import importlib
+import inspect
+import threading
+from typing import Any
+
+import pytest
+
+from wokwi_client import WokwiClientSync
+
+from .fakes import patch_connect
+
+# The internals under test aren't part of the typed interface (client_sync.pyi)
+_SharedLoop: Any = importlib.import_module("wokwi_client.client_sync")._SharedLoop
+
+
+def _internals(obj: object) -> Any:
+    return obj
+
+
+def test_batch_results_in_call_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Calls recorded in a batch run together and their results come back in order."""
+    patch_connect(monkeypatch)
+    with WokwiClientSync("token") as client:
+        with client.batch() as batch:
+            batch.read_pin("uno", "A1")
+            batch.set_control("btn1", "pressed", 1)
+            batch.read_pin("uno", "A2")
+        results: list[Any] = batch.results
+        assert len(results) == 3
+        assert results[0]["echo"] == {"part": "uno", "pin": "A1"}
+        assert results[1] is None
+        assert results[2]["echo"] == {"part": "uno", "pin": "A2"}
+
+
+def test_batch_closes_coroutines_when_block_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """If the block raises, the recorded calls are closed without being sent."""
+    sockets = patch_connect(monkeypatch)
+    with WokwiClientSync("token") as client:
+        with pytest.raises(ValueError), client.batch() as batch:
+            batch.read_pin("uno", "A1")
+            coro = _internals(batch)._coros[0]
+            raise ValueError
+        assert inspect.getcoroutinestate(coro) == inspect.CORO_CLOSED
+        assert batch.results == []
+        assert "pin:read" not in sockets[0].commands()
+
+
+def test_batch_rejects_non_coroutine_methods(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_connect(monkeypatch)
+    with WokwiClientSync("token") as client, client.batch() as batch:
+        with pytest.raises(AttributeError):
+            batch.serial_monitor(print)
+
+
+def test_shared_loop_reference_count() -> None:
+    """Clients share one loop thread, which stops when the last of them disconnects."""
+    first = WokwiClientSync("token")
+    second = WokwiClientSync("token")
+    shared = _internals(first)._shared_loop
+    try:
+        assert _internals(second)._shared_loop is shared
+        assert shared.refs == 2
+        assert shared.thread.is_alive()
+
+        first.disconnect()
+        assert shared.refs == 1
+        assert shared.thread.is_alive()
+        assert not shared.loop.is_closed()
+    finally:
+        second.disconnect()
+    assert shared.refs == 0
+    assert not shared.thread.is_alive()
+    assert shared.loop.is_closed()
+    # The next client starts a new loop
+    third = WokwiClientSync("token")
+    try:
+        assert _internals(third)._shared_loop is not shared
+        assert _SharedLoop._instances[False] is _internals(third)._shared_loop
+    finally:
+        third.disconnect()
+
+
+def test_reconnect_after_disconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A disconnected client can connect again, on a fresh connection."""
+    sockets = patch_connect(monkeypatch)
+    client = WokwiClientSync("token")
+    assert client.connect() == {"version": "1.0"}
+    client.disconnect()
+    with pytest.raises(RuntimeError):
+        client.read_pin("uno", "A1")
+
+    assert client.connect() == {"version": "1.0"}
+    try:
+        assert _internals(client.read_pin("uno", "A1"))["echo"] == {"part": "uno", "pin": "A1"}
+    finally:
+        client.disconnect()
+    assert len(sockets) == 2
+    assert [command for command in sockets[1].commands() if command == "pin:read"] == ["pin:read"]
+
+
+def test_stop_serial_monitors_after_disconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    """stop_serial_monitors() does nothing once the client (and its loop) is gone."""
+    patch_connect(monkeypatch)
+    client = WokwiClientSync("token")
+    client.connect()
+    shared = _internals(client)._shared_loop
+    client.disconnect()
+    assert shared.loop.is_closed()
+    client.stop_serial_monitors()
+
+
+def test_blocking_call_from_async_serial_callback_raises(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A blocking call from an async monitor callback (on the loop thread) raises."""
+    sockets = patch_connect(monkeypatch)
+    errors: list[Exception] = []
+    done = threading.Event()
+
+    with WokwiClientSync("token") as client:
+
+        async def on_line(line: bytes) -> None:
+            try:
+                client.read_pin("uno", "A1")
+            except RuntimeError as e:
+                errors.append(e)
+            done.set()
+
+        client.serial_monitor(on_line)
+        ws = sockets[0]
+        event = {
+            "type": "event",
+            "event": "serial-monitor:data",
+            "payload": {"bytes": list(b"hi\n")},
+            "nanos": 0,
+            "paused": False,
+        }
+        # Send the line once the monitor has subscribed
+        while "serial-monitor:listen" not in ws.commands():
+            threading.Event().wait(0.001)
+        _internals(client)._loop.call_soon_threadsafe(ws.push, event)
+        assert done.wait(2)
+
+    assert len(errors) == 1
+    assert "event loop thread" in str(errors[0])
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from typing import Literal, cast
+
+from wokwi_client.event_queue import EventQueue
+from wokwi_client.protocol_types import EventMessage
+from wokwi_client.transport import Transport
+
+
+def _event(value: int) -> EventMessage:
+    return cast(
+        EventMessage,
+        {
+            "type": "event",
+            "event": "test",
+            "payload": {"value": value},
+            "nanos": 0,
+            "paused": False,
+        },
+    )
+
+
+def test_concurrent_getters_each_receive_an_event() -> None:
+    """Several tasks may wait on the same queue; each event wakes exactly one of them."""
+
+    async def main() -> list[int]:
+        transport = Transport("token")
+        with EventQueue(transport, "test") as queue:
+            getters = [asyncio.create_task(queue.get()) for _ in range(3)]
+            await asyncio.sleep(0)
+            for value in range(3):
+                await transport._dispatch_event(_event(value))
+            events = await asyncio.wait_for(asyncio.gather(*getters), 1)
+        return [event["payload"]["value"] for event in events]
+
+    assert sorted(asyncio.run(main())) == [0, 1, 2]
+
+
+def test_cancelled_getter_passes_its_event_on() -> None:
+    """An event meant for a getter that gets cancelled is delivered to the next one."""
+
+    async def main() -> int:
+        transport = Transport("token")
+        with EventQueue(transport, "test") as queue:
+            first = asyncio.create_task(queue.get())
+            second = asyncio.create_task(queue.get())
+            await asyncio.sleep(0)
+            await transport._dispatch_event(_event(7))
+            first.cancel()
+            event = await asyncio.wait_for(second, 1)
+        return int(event["payload"]["value"])
+
+    assert asyncio.run(main()) == 7
+
+
+def _values_after_overflow(on_overflow: Literal["drop_new", "drop_oldest"]) -> list[int]:
+    async def main() -> list[int]:
+        transport = Transport("token")
+        with EventQueue(transport, "test", maxsize=2, on_overflow=on_overflow) as queue:
+            for value in range(5):
+                await transport._dispatch_event(_event(value))
+            values = []
+            while True:
+                try:
+                    values.append(queue.get_nowait()["payload"]["value"])
+                except asyncio.QueueEmpty:
+                    return values
+
+    return asyncio.run(main())
+
+
+def test_overflow_drop_new() -> None:
+    """A full queue with on_overflow="drop_new" keeps the first events."""
+    assert _values_after_overflow("drop_new") == [0, 1]
+
+
+def test_overflow_drop_oldest() -> None:
+    """A full queue with on_overflow="drop_oldest" keeps the latest events."""
+    assert _values_after_overflow("drop_oldest") == [3, 4]
+
+
+def test_unbounded_by_default() -> None:
+    """Without maxsize the queue keeps every event."""
+
+    async def main() -> int:
+        transport = Transport("token")
+        with EventQueue(transport, "test") as queue:
+            for value in range(100):
+                await transport._dispatch_event(_event(value))
+            return len(queue._events)
+
+    assert asyncio.run(main()) == 100
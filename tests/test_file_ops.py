@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import base64
+import os
+from pathlib import Path
+
+from wokwi_client.file_ops import _DECODE_CHUNK, write_base64_file
+
+# Spans several decode chunks, and doesn't end on a chunk boundary
+DATA = os.urandom(_DECODE_CHUNK // 4 * 3 * 2 + 1234)
+
+
+def test_write_base64_file_multi_chunk(tmp_path: Path) -> None:
+    """A payload decoded chunk by chunk round-trips to the original bytes."""
+    path = tmp_path / "out.bin"
+    write_base64_file(path, base64.b64encode(DATA).decode())
+    assert path.read_bytes() == DATA
+
+
+def test_write_base64_file_with_line_breaks(tmp_path: Path) -> None:
+    """Line-wrapped base64 is accepted, like the single decode in `download()`."""
+    path = tmp_path / "out.bin"
+    write_base64_file(path, base64.encodebytes(DATA).decode())
+    assert path.read_bytes() == DATA
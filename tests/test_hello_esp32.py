@@ -2,8 +2,12 @@
 #
 # SPDX-License-Identifier: MIT
 
+import pytest
+
 from .utils import run_example_module
 
+pytestmark = pytest.mark.requires_token
+
 
 def test_hello_esp32_example() -> None:
     """Async hello_esp32 example should run and exit with 0."""
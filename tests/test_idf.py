@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import json
+from pathlib import Path
+
+import pytest
+
+from wokwi_client import clear_firmware_cache, idf
+
+
+def _write_build(tmp_path: Path, sizes: list[int]) -> str:
+    files = {}
+    for index, size in enumerate(sizes):
+        name = f"part{index}.bin"
+        (tmp_path / name).write_bytes(bytes([index]) * size)
+        files[hex(index * 0x10000)] = name
+    flasher_args = tmp_path / "flasher_args.json"
+    flasher_args.write_text(json.dumps({"flash_files": files}))
+    return str(flasher_args)
+
+
+def test_firmware_cache_evicts_least_recently_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The cache stays within its byte limit, and keeps its running total in sync."""
+    monkeypatch.setattr(idf._FIRMWARE_CACHE, "max_size", 250)
+    clear_firmware_cache()
+    try:
+        result = idf.resolveIdfFirmware(_write_build(tmp_path, [100, 100, 100]))
+        assert [len(part["data"]) for part in result["parts"]] == [100, 100, 100]
+        assert [key[0] for key in idf._FIRMWARE_CACHE.entries] == [
+            str(tmp_path / "part1.bin"),
+            str(tmp_path / "part2.bin"),
+        ]
+        assert idf._FIRMWARE_CACHE.size == 200
+    finally:
+        clear_firmware_cache()
+    assert not idf._FIRMWARE_CACHE.entries
+    assert idf._FIRMWARE_CACHE.size == 0
@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import io
+import sys
+from typing import Optional
+
+import pytest
+
+from wokwi_client.serial import StdoutWriter
+
+
+class FakeStdout(io.TextIOWrapper):
+    """A stdout replacement that records what is written to its binary buffer."""
+
+    def __init__(self, encoding: str = "utf-8", tty: bool = False) -> None:
+        self.raw_output = io.BytesIO()
+        super().__init__(self.raw_output, encoding=encoding, write_through=True)
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def output(self) -> bytes:
+        self.flush()
+        return self.raw_output.getvalue()
+
+
+def _run_writer(
+    monkeypatch: pytest.MonkeyPatch,
+    stdout: object,
+    lines: list[bytes],
+    decode_utf8: Optional[bool] = None,
+) -> None:
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    async def main() -> None:
+        writer = StdoutWriter(decode_utf8)
+        for line in lines:
+            writer.write(line)
+        writer.close()
+
+    asyncio.run(main())
+
+
+def test_flushes_once_buffer_is_full(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Output is held back until `flush_size` bytes are pending."""
+    stdout = FakeStdout()
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    async def main() -> None:
+        writer = StdoutWriter(flush_size=8, flush_interval=60)
+        writer.write(b"abc")
+        assert stdout.output() == b""
+        writer.write(b"defghi")
+        assert stdout.output() == b"abcdefghi"
+        writer.close()
+
+    asyncio.run(main())
+
+
+def test_flushes_after_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A pending line is written `flush_interval` seconds after it arrived."""
+    stdout = FakeStdout()
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    async def main() -> None:
+        writer = StdoutWriter(flush_size=4096, flush_interval=0.01)
+        writer.write(b"line\n")
+        assert stdout.output() == b""
+        await asyncio.sleep(0.05)
+        assert stdout.output() == b"line\n"
+        writer.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+def test_multibyte_character_split_across_lines(
+    monkeypatch: pytest.MonkeyPatch, encoding: str
+) -> None:
+    """A UTF-8 character split over two lines is decoded whole, in stdout's encoding."""
+    stdout = FakeStdout(encoding)
+    _run_writer(monkeypatch, stdout, [b"a\xc3", b"\xa9b\n"], decode_utf8=True)
+    assert stdout.output() == "aéb\n".encode(encoding)
+
+
+def test_incomplete_trailing_character_is_written_on_close(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stdout = FakeStdout()
+    _run_writer(monkeypatch, stdout, [b"ok\xc3"], decode_utf8=True)
+    assert stdout.output() == "ok�".encode()
+
+
+def test_text_only_stdout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without a binary `.buffer` (e.g. io.StringIO), output is written as text."""
+    stdout = io.StringIO()
+    _run_writer(monkeypatch, stdout, [b"hello ", b"\xc3\xa9\n"], decode_utf8=True)
+    assert stdout.getvalue() == "hello é\n"
+
+
+def test_decodes_by_default_only_on_a_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    """By default, invalid UTF-8 is replaced on a terminal and passed through otherwise."""
+    tty = FakeStdout("utf-8", tty=True)
+    _run_writer(monkeypatch, tty, [b"x\xff\n"])
+    assert tty.output() == "x�\n".encode()
+
+    redirected = FakeStdout("utf-8", tty=False)
+    _run_writer(monkeypatch, redirected, [b"x\xff\n"])
+    assert redirected.output() == b"x\xff\n"
+
+
+def test_raw_mode_accepts_byte_value_lists(monkeypatch: pytest.MonkeyPatch) -> None:
+    stdout = FakeStdout()
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    async def main() -> None:
+        writer = StdoutWriter(decode_utf8=False)
+        writer.write(list(b"ab"))
+        writer.write(b"c\n")
+        writer.close()
+
+    asyncio.run(main())
+    assert stdout.output() == b"abc\n"
@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: 2025-present CodeMagic LTD
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+from wokwi_client import control, pins, serial, simulation, touch
+from wokwi_client.exceptions import ServerError
+from wokwi_client.protocol_types import EventMessage
+from wokwi_client.transport import Transport
+
+from .fakes import FakeWebSocket, patch_connect
+
+# Names that need escaping, non-ASCII text, and text that looks like the placeholder value
+PARTS = ["btn1", 'q"u\\o\te', "ünï😀", "0.0"]
+
+
+def _encoded(command: str, params: dict[str, Any]) -> dict[str, Any]:
+    """The frame `command_template()` produces for the command, as a dict (without id)."""
+    frame: dict[str, Any] = json.loads(Transport.command_template(command, params) + '0"}')
+    del frame["id"]
+    return frame
+
+
+def _without_ids(sent: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{key: value for key, value in message.items() if key != "id"} for message in sent]
+
+
+async def _connect(
+    monkeypatch: pytest.MonkeyPatch, hold: bool = False, max_inflight: int = 1024
+) -> tuple[Transport, FakeWebSocket]:
+    sockets = patch_connect(monkeypatch, hold)
+    transport = Transport("token", max_inflight=max_inflight)
+    await transport.connect()
+    return transport, sockets[0]
+
+
+def test_spliced_frames_match_encoded_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Frames built by splicing values into cached templates decode like encoded ones."""
+    values = [0, 1, True, 0.5, -1e-7, 1e22, 123456789.125]
+    coords = [0, 17, 3.25, -0.0, 1e-9]
+
+    async def main() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        transport, ws = await _connect(monkeypatch)
+        expected = []
+        for part in PARTS:
+            for value in values:
+                await control.set_control(transport, part=part, control="pressed", value=value)
+                expected.append(
+                    _encoded(
+                        "control:set", {"part": part, "control": "pressed", "value": float(value)}
+                    )
+                )
+            await pins.pin_read(transport, part=part, pin="D1")
+            expected.append(_encoded("pin:read", {"part": part, "pin": "D1"}))
+            for x, y in zip(coords, reversed(coords)):
+                for release_after in (None, 1000):
+                    await touch.touch_event(
+                        transport, part=part, x=x, y=y, event="press", release_after=release_after
+                    )
+                    params: dict[str, Any] = {"part": part, "event": "press"}
+                    if release_after is not None:
+                        params["releaseAfter"] = release_after
+                    params.update(x=x, y=y)
+                    expected.append(_encoded("touch:event", params))
+        await simulation.pause(transport)
+        expected.append(_encoded("sim:pause", {}))
+        await simulation.resume(transport)
+        expected.append(_encoded("sim:resume", {"pauseAfter": None}))
+        await simulation.resume(transport, pause_after=5)
+        expected.append(_encoded("sim:resume", {"pauseAfter": 5}))
+        await transport.close()
+        return _without_ids(ws.sent), expected
+
+    sent, expected = asyncio.run(main())
+    assert sent == expected
+
+
+def test_request_ids_and_result_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Batched requests get unique ids and results come back in request order."""
+
+    async def main() -> tuple[list[Any], list[str]]:
+        transport, ws = await _connect(monkeypatch, hold=True)
+        commands = [("pin:read", {"part": "u", "pin": str(i)}) for i in range(5)]
+        batch = asyncio.create_task(transport.request_many(commands))
+        while len(ws.held) < len(commands):
+            await asyncio.sleep(0)
+        # Answer in reverse order: results must still line up with the requests
+        ws.release(reverse=True)
+        responses = await batch
+        await transport.close()
+        return [response["result"]["echo"]["pin"] for response in responses], [
+            message["id"] for message in ws.sent
+        ]
+
+    pins_read, ids = asyncio.run(main())
+    assert pins_read == ["0", "1", "2", "3", "4"]
+    assert len(set(ids)) == len(ids)
+
+
+def test_error_response_fails_only_its_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An error response raises ServerError for its own request only."""
+
+    async def main() -> tuple[list[Any], Any]:
+        transport, _ = await _connect(monkeypatch)
+        results = await asyncio.gather(
+            transport.request("ok", {"n": 1}),
+            transport.request("fail", {}),
+            transport.request("ok", {"n": 2}),
+            return_exceptions=True,
+        )
+        # The receive loop is still running
+        after = await transport.request("ok", {"n": 3})
+        await transport.close()
+        return list(results), after
+
+    results, after = asyncio.run(main())
+    assert results[0]["result"]["echo"] == {"n": 1}
+    assert isinstance(results[1], ServerError)
+    assert str(results[1]) == "boom"
+    assert results[2]["result"]["echo"] == {"n": 2}
+    assert after["result"]["echo"] == {"n": 3}
+
+
+def test_error_response_in_batch_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """request_many() raises ServerError when one of the commands fails."""
+
+    async def main() -> None:
+        transport, _ = await _connect(monkeypatch)
+        try:
+            with pytest.raises(ServerError):
+                await transport.request_many([("ok", {}), ("fail", {}), ("ok", {})])
+        finally:
+            await transport.close()
+
+    asyncio.run(main())
+
+
+def test_inflight_slot_freed_on_success_and_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The in-flight limit releases its slot whether a request succeeds or fails."""
+
+    async def main() -> None:
+        transport, ws = await _connect(monkeypatch, max_inflight=1)
+        try:
+            await transport.request("ok", {})
+            with pytest.raises(ServerError):
+                await transport.request("fail", {})
+            ws.send_error = ConnectionError("send failed")
+            with pytest.raises(ConnectionError):
+                await transport.request("ok", {})
+            ws.send_error = None
+            # More commands than the limit: sending waits for earlier responses
+            responses = await asyncio.wait_for(transport.request_many([("ok", {})] * 3), 1)
+            assert len(responses) == 3
+            assert not transport._response_futures
+            await asyncio.wait_for(transport.request("ok", {}), 1)
+        finally:
+            await transport.close()
+
+    asyncio.run(main())
+
+
+def test_subscribe_sends_once_per_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    """serial-monitor:listen is sent once, and again after reconnecting."""
+
+    async def main() -> list[FakeWebSocket]:
+        sockets = patch_connect(monkeypatch)
+        transport = Transport("token")
+        await transport.connect()
+        await transport.subscribe(serial._LISTEN_TEMPLATE)
+        await transport.subscribe(serial._LISTEN_TEMPLATE)
+        await transport.close()
+        await transport.connect()
+        await transport.subscribe(serial._LISTEN_TEMPLATE)
+        await transport.close()
+        return sockets
+
+    sockets = asyncio.run(main())
+    assert [ws.commands() for ws in sockets] == [
+        ["serial-monitor:listen"],
+        ["serial-monitor:listen"],
+    ]
+
+
+def test_event_listeners_run_in_registration_order() -> None:
+    """Sync and async listeners are called in the order they were added."""
+    calls: list[str] = []
+
+    async def async_listener(event: Any) -> None:
+        calls.append("async")
+
+    async def main() -> None:
+        transport = Transport("token")
+        event = cast(EventMessage, {"type": "event", "event": "test", "payload": {}, "nanos": 0})
+        transport.add_event_listener("test", lambda event: calls.append("first"))
+        transport.add_event_listener("test", async_listener)
+        transport.add_event_listener("test", lambda event: calls.append("last"))
+        await transport._dispatch_event(event)
+        transport.remove_event_listener("test", async_listener)
+        await transport._dispatch_event(event)
+
+    asyncio.run(main())
+    assert calls == ["first", "async", "last", "first", "last"]
@@ -1,40 +1,100 @@
 """
 Test utilities for running example modules.
 
-Provides a helper to execute `python -m <module>` with a short sleep to keep
-CI fast and shared environment handling (WOKWI_CLI_TOKEN, etc.).
+Provides a helper to execute an example module (`python -m <module>`) with a short sleep to
+keep CI fast and shared environment handling (WOKWI_CLI_TOKEN, etc.).
 """
 
 from __future__ import annotations
 
+import contextlib
+import io
 import os
+import runpy
 import subprocess
 import sys
-from collections.abc import Mapping
+import traceback
+from collections.abc import Iterator, Mapping
 from subprocess import CompletedProcess
 
+# Snapshot of the environment the examples run with, taken once for the whole session
+_BASE_ENV = os.environ.copy()
+_TOKEN_OK = bool(_BASE_ENV.get("WOKWI_CLI_TOKEN"))
+
 
 def run_example_module(
     module: str, *, sleep_time: str = "1", extra_env: Mapping[str, str] | None = None
 ) -> CompletedProcess[str]:
     """Run an example module with a short simulation time.
 
-    Requires WOKWI_CLI_TOKEN to be set in the environment.
+    Requires WOKWI_CLI_TOKEN to be set in the environment (tests that use this helper are
+    marked `requires_token`, which skips them otherwise).
     Returns the CompletedProcess so tests can assert on return code and output.
+
+    The module runs inside the test process, which skips interpreter startup and
+    re-importing wokwi_client for every example. Set WOKWI_TESTS_SUBPROCESS=1 to run
+    each example in its own `python -m` process instead.
     """
+    overrides = {"WOKWI_SLEEP_TIME": sleep_time}
+    if extra_env:
+        overrides.update(extra_env)
 
-    assert os.environ.get("WOKWI_CLI_TOKEN") is not None, (
-        "WOKWI_CLI_TOKEN environment variable is not set. You can get it from https://wokwi.com/dashboard/ci."
-    )
+    if _BASE_ENV.get("WOKWI_TESTS_SUBPROCESS") == "1":
+        env = _BASE_ENV.copy()
+        env.update(overrides)
+        # close_fds=False lets CPython launch the child with posix_spawn() rather than
+        # fork() + exec(), which doesn't copy pytest's page tables. Our own descriptors are
+        # non-inheritable (PEP 446), so nothing leaks into the child.
+        return subprocess.run(
+            [sys.executable, "-m", module],
+            check=False,
+            capture_output=True,
+            text=True,
+            env=env,
+            close_fds=False,
+        )
+    return _run_in_process(module, overrides)
 
-    env = {**os.environ, "WOKWI_SLEEP_TIME": sleep_time}
-    if extra_env:
-        env.update(extra_env)
-
-    return subprocess.run(
-        [sys.executable, "-m", module],
-        check=False,
-        capture_output=True,
-        text=True,
-        env=env,
-    )
+
+def _run_in_process(module: str, overrides: Mapping[str, str]) -> CompletedProcess[str]:
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with _env_overlay(overrides):
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            returncode = _run_module(module)
+    args = [sys.executable, "-m", module]
+    return CompletedProcess(args, returncode, stdout.getvalue(), stderr.getvalue())
+
+
+@contextlib.contextmanager
+def _env_overlay(overrides: Mapping[str, str]) -> Iterator[None]:
+    """Apply `overrides` to os.environ for the duration of the block.
+
+    Only the overridden variables are saved and restored, the rest of the environment
+    isn't copied.
+    """
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _run_module(module: str) -> int:
+    """Run a module as `__main__`, returning the exit code `python -m` would have."""
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0